@@ -3,23 +3,97 @@
 """Base classes for the implementation of a generic syntax tree."""
 
 from abc import abstractmethod, ABC
-from typing import Sequence, Set, Tuple, TypeVar, Generic, cast, Union, Optional, Any
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    Sequence,
+    Set,
+    FrozenSet,
+    Tuple,
+    TypeVar,
+    Generic,
+    cast,
+    Union,
+    Optional,
+    Any,
+)
 import re
 
 from ltlf2dfa.symbols import Symbols, OpSymbol
-from ltlf2dfa.helpers import Hashable, Wrapper
+from ltlf2dfa.helpers import HashConsing, Hashable, Wrapper, memoize_program
 
 AtomSymbol = Union["QuotedFormula", str]
 
+_L = Symbols.ROUND_BRACKET_LEFT.value
+_R = Symbols.ROUND_BRACKET_RIGHT.value
+
 
 class Formula(Hashable, ABC):
     """Abstract class for a formula."""
 
+    # '_closure_set' and '_not' are caches of the logics that set them
+    __slots__ = (
+        "_labels",
+        "_mona_vars",
+        "_nnf",
+        "_mona_cache",
+        "_closure_set",
+        "_not",
+    )
+
+    # whether '_to_nnf' is built from the NNF of the operands, which can then
+    # be computed beforehand (see '_normalize_operands')
+    _nnf_from_operands = True
+
+    def __init__(self):
+        """Initialize the formula."""
+        super().__init__()
+        self._labels = None  # type: Optional[FrozenSet[AtomSymbol]]
+        self._mona_vars = None  # type: Optional[FrozenSet[str]]
+        self._nnf = None  # type: Optional[Formula]
+        self._mona_cache = None  # type: Optional[Dict[Tuple[str, str], str]]
+
+    def find_labels(self) -> FrozenSet[AtomSymbol]:
+        """
+        Return the set of symbols.
+
+        Formulas are immutable, hence the result is computed once and cached.
+
+        :return: the set of symbols.
+        """
+        if self._labels is None:
+            self._labels = frozenset(self._find_labels())
+        return self._labels
+
     @abstractmethod
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> AbstractSet[AtomSymbol]:
         """Return the set of symbols."""
 
+    def mona_vars(self) -> FrozenSet[str]:
+        """
+        Return the names of the MONA second-order variables of the symbols.
+
+        :return: the set of upper-cased symbols, cached as find_labels.
+        """
+        if self._mona_vars is None:
+            self._mona_vars = frozenset({v.upper() for v in self.find_labels()})
+        return self._mona_vars
+
     def to_nnf(self) -> "Formula":
+        """
+        Transform the formula in NNF.
+
+        Formulas are immutable, hence the result is computed once and cached.
+
+        :return: the formula in NNF.
+        """
+        if self._nnf is None:
+            _normalize_operands(self)
+            self._nnf = self._to_nnf()
+        return self._nnf
+
+    def _to_nnf(self) -> "Formula":
         """Transform the formula in NNF."""
         return self
 
@@ -40,7 +114,15 @@ class AtomicFormula(Formula, ABC):
     be a quoted string.
     """
 
-    name_regex = re.compile(r'(\w+)|(".*")')
+    __slots__ = ("s",)
+
+    name_regex = re.compile(r'(?:\w+|"[^"]*")')
+    _name_match = name_regex.fullmatch
+
+    def __init_subclass__(cls, **kwargs):
+        """Bind the name matcher of the (possibly overridden) naming convention."""
+        super().__init_subclass__(**kwargs)
+        cls._name_match = cls.name_regex.fullmatch
 
     def __init__(self, s: Union[AtomSymbol, Formula]):
         """Inintializes the atomic formula.
@@ -57,19 +139,50 @@ class AtomicFormula(Formula, ABC):
         # If name
         else:
             self.s = str(s)
-            if not self.name_regex.fullmatch(self.s):
+            if not self._name_match(self.s):
                 raise ValueError(
                     "The symbol name does not respect the naming convention."
                 )
 
+    @classmethod
+    def _unchecked(cls, s: str) -> "AtomicFormula":
+        """Build the atomic formula skipping the naming convention check.
+
+        :param s: a symbol name already known to respect the naming convention,
+            e.g. a token produced by a parser with the same name regex.
+        """
+        if isinstance(cls, HashConsing):
+            # the atom is keyed by its name: reuse it before allocating
+            obj = cls._instances.get(s)
+            if obj is not None:
+                return obj
+        obj = cls.__new__(cls)
+        obj._init_unchecked(s)
+        if isinstance(cls, HashConsing):
+            return cls._intern(obj)
+        return obj
+
+    def _init_unchecked(self, s: str) -> None:
+        """Initialize the atomic formula skipping the naming convention check.
+
+        :param s: a symbol name already known to respect the naming convention.
+        """
+        super().__init__()
+        self.s = s
+
     def _members(self):
         return self.s
 
+    def _init_args(self) -> tuple:
+        if isinstance(self.s, QuotedFormula):
+            return (self.s.wrapped,)
+        return (self.s,)
+
     def __str__(self):
         """Get the string representation."""
         return str(self.s)
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Return the set of symbols."""
         return {self.s}
 
@@ -81,13 +194,15 @@ class QuotedFormula(Wrapper):
     hashable objects and for atomic symbols.
     """
 
+    __slots__ = ("_QuotedFormula__str",)
+
     def __init__(self, f: Formula):
         """Initialize.
 
         :param f: formula to represent.
         """
         super().__init__(f)
-        self.__dict__["_QuotedFormula__str"] = '"' + str(f) + '"'
+        self._init_slot("_QuotedFormula__str", f'"{f}"')
 
     def __str__(self):
         """Cache str."""
@@ -98,11 +213,25 @@ class QuotedFormula(Wrapper):
         return str(self)
 
 
+def build_mona_var_strings(mona_vars: Sequence[str]) -> Tuple[str, str, str]:
+    """
+    Build the primed variables, subset and inequality constraints of MONA vars.
+
+    :param mona_vars: the (sorted) MONA variables.
+    :return: the joined primed variables, subset and inequality constraints.
+    """
+    if not mona_vars:
+        return "", "", ""
+    vars_p = "_p,".join(mona_vars) + "_p"
+    vars_sub = "&".join([f"{v}_p sub {v}" for v in mona_vars])
+    vars_neq = "|".join([f"{v}_p ~= {v}" for v in mona_vars])
+    return vars_p, vars_sub, vars_neq
+
+
 class MonaProgram:
     """Implements a MONA program."""
 
     header = "m2l-str"
-    vars: Set[str] = set()
 
     def __init__(self, f: Formula):
         """Initialize.
@@ -111,37 +240,48 @@ class MonaProgram:
         :param i: instant of evaluation in the trace.
         """
         self.formula = f
+        self.vars = frozenset()  # type: FrozenSet[str]
+        self._program_cache = None  # type: Optional[str]
         self._set_vars()
 
     def _set_vars(self):
         """Set MONA vars."""
-        self.vars = set([v.upper() for v in self.formula.find_labels()])
+        self.vars = self.formula.mona_vars()
+        self._sorted_vars = tuple(sorted(self.vars))
 
     def __repr__(self):
         """Nice representation."""
         return str(self)
 
+    @memoize_program
     def mona_program(self) -> str:
         """Construct the MONA program."""
-        if self.vars:
-            return "#{};\n{};\nvar2 {};\n{};\n".format(
-                str(self.formula),
-                self.header,
-                ", ".join(self.vars),
-                self.formula.to_mona("0"),
-            )
-        else:
-            return "#{};\n{};\n{};\n".format(
-                str(self.formula), self.header, self.formula.to_mona("0")
-            )
+        chunks = []  # type: list
+        self.write_program(chunks.append)
+        return "".join(chunks)
+
+    def write_program(self, write: Callable[[str], Any]):
+        """Write the MONA program piece by piece, e.g. to an open file.
+
+        The encoding of the formula is passed to write as it is, without
+        being copied into the text of the whole program.
 
+        :param write: called with each fragment of the program, in order.
+        """
+        if self._program_cache is not None:
+            write(self._program_cache)
+            return
+        write(f"#{self.formula};\n{self.header};\n")
+        if self.vars:
+            write(f"var2 {', '.join(self._sorted_vars)};\n")
+        write(self.formula.to_mona("0"))
+        write(";\n")
 
 
 class MonaSM:
     """Implements a MONA SM program."""
 
     header = "m2l-str"
-    vars: Set[str] = set()
 
     def __init__(self, f: Formula):
         """Initialize.
@@ -150,41 +290,52 @@ class MonaSM:
         :param i: instant of evaluation in the trace.
         """
         self.formula = f
+        self.vars = frozenset()  # type: FrozenSet[str]
+        self._program_cache = None  # type: Optional[str]
         self._set_vars()
 
     def _set_vars(self):
         """Set MONA vars."""
-        self.vars = set([v.upper() for v in self.formula.find_labels()])
+        self.vars = self.formula.mona_vars()
+        self._sorted_vars = tuple(sorted(self.vars))
 
     def __repr__(self):
         """Nice representation."""
         return str(self)
 
+    @memoize_program
     def mona_program(self) -> str:
         """Construct the MONA program."""
-        if self.vars:
-
-            return "#{0};\n{1};\nvar2 {2};\n{3} & ~(ex2 {4}: ({5} & ({6})&({7})));\n".format(
-                str(self.formula),
-                self.header,
-                ", ".join(self.vars),
-                self.formula.to_mona("0"),
-                ",".join(["{0}_p".format(v) for v in self.vars]),
-                "&".join(["{0}_p sub {0}".format(v) for v in self.vars]),
-                "|".join(["{0}_p ~= {0}".format(v) for v in self.vars]),
-                self.formula.to_mona_s("0")
-            )
-        else:
-            return "#{};\n{};\n{};\n".format(
-                str(self.formula), self.header, self.formula.to_mona("0")
-            )
-
+        chunks = []  # type: list
+        self.write_program(chunks.append)
+        return "".join(chunks)
 
+    def write_program(self, write: Callable[[str], Any]):
+        """Write the MONA program piece by piece, e.g. to an open file.
 
+        :param write: called with each fragment of the program, in order.
+        """
+        if self._program_cache is not None:
+            write(self._program_cache)
+            return
+        formula = self.formula
+        write(f"#{formula};\n{self.header};\n")
+        if self.vars:
+            vars_p, vars_sub, vars_neq = build_mona_var_strings(self._sorted_vars)
+            write(f"var2 {', '.join(self._sorted_vars)};\n")
+            write(formula.to_mona("0"))
+            write(f" & ~(ex2 {vars_p}: ({vars_sub} & ({vars_neq})&(")
+            write(formula.to_mona_s("0"))
+            write(")));\n")
+        else:
+            write(formula.to_mona("0"))
+            write(";\n")
 
 
 class MonaPSE:
-    vars: Set[str] = set()
+    """Implements a MONA program checking the strong equivalence of two formulas."""
+
+    header = "m2l-str"
 
     def __init__(self, f1: Formula, f2: Formula):
         """Initialize.
@@ -192,283 +343,100 @@ class MonaPSE:
         :param f2: formula to encode.
         """
         self.f1,self.f2 = f1,f2
-        self.vars = set([v.upper() for v in f1.find_labels()]).union(set([v.upper() for v in f2.find_labels()]))
-
-    def _set_vars(self):
-        """Set MONA vars."""
-        self.vars = set([v.upper() for v in self.f.find_labels()])
+        self._v1, self._v2 = f1.mona_vars(), f2.mona_vars()
+        self.vars = self._v1 | self._v2
+        self._sorted_v1, self._sorted_v2 = tuple(sorted(self._v1)), tuple(sorted(self._v2))
+        self._sorted_vars = tuple(sorted(self.vars))
+        self._repr = None  # type: Optional[str]
+        self._program_cache = None  # type: Optional[str]
 
     def __repr__(self):
         """Nice representation."""
-        return "({})<->({})".formatstr(self)
+        if self._repr is None:
+            self._repr = f"({self.f1})<->({self.f2})"
+        return self._repr
 
+    @memoize_program
     def mona_program(self) -> str:
         """Construct the MONA program."""
-        monaOutput = None
-        v1 = set([v.upper() for v in self.f1.find_labels()])
-        v2 = set([v.upper() for v in self.f2.find_labels()])
-        if v1.issubset(v2) and v2.issubset(v1): # strong equivalence on the same signature
-            if len(v1) == 0 and len(v2) == 0:
-                monaOutput = "#{0} <-> {1} in THTf;\n{2};\n ~((({3}) <=> ({4})) & (({5}) <=>({6})));\n".format(
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    self.f2.to_mona_s("0")
-            )
-            else:
-                monaOutput = "#{0} <-> {1} in THTf;\n{2};\nvar2 {3};\n  ~(({4}) => ((({5}) <=> ({6})) & (({7}) <=>({8}))));\n".format(
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in self.vars]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in self.vars]),
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    self.f2.to_mona_s("0")
-            )
-        elif v1.issubset(v2): # f2 must be existentially quantified  
-            exv2 = v2.difference(v1)
-            print(exv2)
-
-
-            monaOutput = "#({0}) <->(ex2 {1}: ({2})) ;\n{3};\n".format(self.f1,
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2,
-                    self.header,
-                    )
-            if len(v1) != 0:
-                monaOutput += "var2 {0};\n".format(",".join(["{0},{0}_p".format(v) for v in v1])) 
-                monaOutput += "~(({0} <=> (ex2 {1}: {2})) & (({3} & {4}) <=> (ex2 {5}: ({6} & {7})))) ;\n".format(
-                    self.f1.to_mona("0"),
-                     ",".join(["{0}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
-                    )
-            else:
-                #monaOutput += "var2 {0};\n".format(",".join(["{0},{0}_p".format(v) for v in v1])) 
-                monaOutput += "~(({0} <=> (ex2 {1}: {2})) & (({3}) <=> (ex2 {4}: ({5} & {6})))) ;\n".format(
-                    self.f1.to_mona("0"),
-                     ",".join(["{0}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
-                    )
-
-        elif v2.issubset(v1): # f1 must be existentially quantified  
-            exv1 = v1.difference(v2)
-
-            monaOutput = "#(ex2 {0} : ({1})) <->({2}) ;\n{3};\nvar2 {4};\n ~(((ex2 {5}: {6}) <=> ({7})) & ((ex2 {8}: {9} & {10}) <=> ({11} & {12}))) ;\n".format(
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in v2]),
-                    ",".join(["{0}".format(v) for v in exv1]),
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv1]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
-            )
-        
-        else:
-            fv = v1.intersection(v2) # free variables
-            exv1,exv2 = v1.difference(fv), v2.difference(fv)
-            monaOutput = "#(ex2 {0}:{1}) <->(ex2 {2}: ({3})) ;\n{4};\nvar2 {5};\n ~( ( (ex2 {6}: {7} )<=> (ex2 {8} : {9})) &  ( (ex2 {10}: {11} &  {12} )<=> (ex2 {13} : {14} & {15}))) ;\n".format(
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1,
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in fv]),
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1.to_mona("0"),
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv1]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0"),
-            )
-        return monaOutput
-
-
+        chunks = []  # type: list
+        self.write_program(chunks.append)
+        return "".join(chunks)
 
+    def write_program(self, write: Callable[[str], Any]):
+        """Write the MONA program piece by piece, e.g. to an open file.
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-class MonaSF:
-    """Implements a MONA SM program."""
-
-    header = "m2l-str"
-    vars: Set[str] = set()
-
-    def __init__(self, f1: Formula, f2: Formula):
-        """Initialize.
-
-        :param f: formula to encode.
-        :param i: instant of evaluation in the trace.
+        :param write: called with each fragment of the program, in order.
         """
-        self.f1,self.f2 = f1,f2
-        self.vars = set([v.upper() for v in f1.find_labels()]).union(set([v.upper() for v in f2.find_labels()]))
-        print(self.vars)
-
-    def _set_vars(self):
-        """Set MONA vars."""
-        self.vars = set([v.upper() for v in self.f.find_labels()])
-
-    def __repr__(self):
-        """Nice representation."""
-        return "({})<->({})".formatstr(self)
-
-    def mona_program(self) -> str:
-        """Construct the MONA program."""
-        monaOutput = None
-        v1 = set([v.upper() for v in self.f1.find_labels()])
-        v2 = set([v.upper() for v in self.f2.find_labels()])
-        if v1.issubset(v2) and v2.issubset(v1): # strong equivalence on the same signature
-            print('normal strong equivalence')
-            if len(v1) == 0 and len(v2) == 0:
-                monaOutput = "#{0} <-> {1} in THTf;\n{2};\n ~((({3}) <=> ({4})) & (({5}) <=>({6})));\n".format(
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    self.f2.to_mona_s("0")
+        if self._program_cache is not None:
+            write(self._program_cache)
+            return
+        v1, v2 = self._v1, self._v2
+        f1, f2, header = self.f1, self.f2, self.header
+        f1m, f2m = f1.to_mona("0"), f2.to_mona("0")
+        f1s, f2s = f1.to_mona_s("0"), f2.to_mona_s("0")
+        sv1, sv2 = self._sorted_v1, self._sorted_v2
+        v1_sub = "&".join(f"{v}_p sub {v}" for v in sv1)
+        v2_sub = "&".join(f"{v}_p sub {v}" for v in sv2)
+        s12, s21 = v1 <= v2, v2 <= v1
+        exv1 = tuple(v for v in sv1 if v not in v2)
+        exv2 = tuple(v for v in sv2 if v not in v1)
+        # the encodings are passed to write as they are, between the template pieces
+        if s12 and s21:  # strong equivalence on the same signature
+            vars_pairs = ",".join(f"{v},{v}_p" for v in self._sorted_vars)
+            vars_sub = "&".join(f"{v}_p sub {v}" for v in self._sorted_vars)
+            chunks = (
+                f"#{f1} <-> {f2} in THTf;\n{header};\n",
+                f"var2 {vars_pairs};\n  ~(({vars_sub}) => (((" if v1 else " ~(((",
+                f1m, ") <=> (", f2m, ")) & ((", f1s, ") <=>(", f2s,
+                "))));\n" if v1 else ")));\n",
             )
-            else:
-                monaOutput = "#{0} <-> {1} in THTf;\n{2};\nvar2 {3};\n  ~(({4}) => ((({5}) <=> ({6})) & (({7}) <=>({8}))));\n".format(
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in self.vars]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in self.vars]),
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    self.f2.to_mona_s("0")
+        elif s12:  # f2 must be existentially quantified
+            exv2_list = ",".join(exv2)
+            exv2_pairs = ",".join(f"{v},{v}_p" for v in exv2)
+            v1_pairs = ",".join(f"{v},{v}_p" for v in sv1)
+            chunks = (
+                f"#({f1}) <->(ex2 {exv2_list}: ({f2})) ;\n{header};\n",
+                f"var2 {v1_pairs};\n" if v1 else "",
+                "~((", f1m, f" <=> (ex2 {exv2_list}: ", f2m, ")) & ((",
+                f"{v1_sub} & " if v1 else "", f1s,
+                f") <=> (ex2 {exv2_pairs}: ({v2_sub} & ", f2s, ")))) ;\n",
             )
-        elif v1.issubset(v2): # f2 must be existentially quantified  
-            exv2 = v2.difference(v1)
-            print(exv2)
-
-
-            monaOutput = "#({0}) <->(ex2 {1}: ({2})) ;\n{3};\n".format(self.f1,
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2,
-                    self.header,
-                    )
-            if len(v1) != 0:
-                monaOutput += "var2 {0};\n".format(",".join(["{0},{0}_p".format(v) for v in v1])) 
-                monaOutput += "~(({0} <=> (ex2 {1}: {2})) & (({3} & {4}) <=> (ex2 {5}: ({6} & {7})))) ;\n".format(
-                    self.f1.to_mona("0"),
-                     ",".join(["{0}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
-                    )
-            else:
-                #monaOutput += "var2 {0};\n".format(",".join(["{0},{0}_p".format(v) for v in v1])) 
-                monaOutput += "~(({0} <=> (ex2 {1}: {2})) & (({3}) <=> (ex2 {4}: ({5} & {6})))) ;\n".format(
-                    self.f1.to_mona("0"),
-                     ",".join(["{0}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
-                    )
-
-        elif v2.issubset(v1): # f1 must be existentially quantified  
-            exv1 = v1.difference(v2)
-
-            monaOutput = "#(ex2 {0} : ({1})) <->({2}) ;\n{3};\nvar2 {4};\n ~(((ex2 {5}: {6}) <=> ({7})) & ((ex2 {8}: {9} & {10}) <=> ({11} & {12}))) ;\n".format(
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1,
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in v2]),
-                    ",".join(["{0}".format(v) for v in exv1]),
-                    self.f1.to_mona("0"),
-                    self.f2.to_mona("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv1]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0")
+        elif s21:  # f1 must be existentially quantified
+            exv1_list = ",".join(exv1)
+            exv1_pairs = ",".join(f"{v},{v}_p" for v in exv1)
+            v2_pairs = ",".join(f"{v},{v}_p" for v in sv2)
+            chunks = (
+                f"#(ex2 {exv1_list} : ({f1})) <->({f2}) ;\n{header};\nvar2 {v2_pairs};\n",
+                f" ~(((ex2 {exv1_list}: ", f1m, ") <=> (", f2m, ")) & ",
+                f"((ex2 {exv1_pairs}: {v1_sub} & ", f1s, f") <=> ({v2_sub} & ", f2s, "))) ;\n",
             )
-        
         else:
-            fv = v1.intersection(v2) # free variables
-            exv1,exv2 = v1.difference(fv), v2.difference(fv)
-            monaOutput = "#(ex2 {0}:{1}) <->(ex2 {2}: ({3})) ;\n{4};\nvar2 {5};\n ~( ( (ex2 {6}: {7} )<=> (ex2 {8} : {9})) &  ( (ex2 {10}: {11} &  {12} )<=> (ex2 {13} : {14} & {15}))) ;\n".format(
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1,
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2, 
-                    self.header,
-                    ",".join(["{0},{0}_p".format(v) for v in fv]),
-                    ",".join(["{}".format(v) for v in exv1]),
-                    self.f1.to_mona("0"),
-                    ",".join(["{}".format(v) for v in exv2]),
-                    self.f2.to_mona("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv1]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v1]),
-                    self.f1.to_mona_s("0"),
-                    ",".join(["{0},{0}_p".format(v) for v in exv2]),
-                    "&".join(["{0}_p sub {0}".format(v) for v in v2]),
-                    self.f2.to_mona_s("0"),
+            fv = tuple(v for v in sv1 if v in v2)  # free variables
+            exv1_list, exv2_list = ",".join(exv1), ",".join(exv2)
+            exv1_pairs = ",".join(f"{v},{v}_p" for v in exv1)
+            exv2_pairs = ",".join(f"{v},{v}_p" for v in exv2)
+            fv_pairs = ",".join(f"{v},{v}_p" for v in fv)
+            chunks = (
+                f"#(ex2 {exv1_list}:{f1}) <->(ex2 {exv2_list}: ({f2})) ;\n{header};\nvar2 {fv_pairs};\n",
+                f" ~( ( (ex2 {exv1_list}: ", f1m, f" )<=> (ex2 {exv2_list} : ", f2m, ")) & ",
+                f" ( (ex2 {exv1_pairs}: {v1_sub} &  ", f1s, f" )<=> (ex2 {exv2_pairs} : {v2_sub} & ",
+                f2s, "))) ;\n",
             )
-        return monaOutput
+        for chunk in chunks:
+            write(chunk)
 
 
+class MonaSF(MonaPSE):
+    """Implements a MONA SM program."""
 
 
 class Operator(Formula, ABC):
     """Implements an operator."""
 
-    base_expression = (
-        Symbols.ROUND_BRACKET_LEFT.value + "%s" + Symbols.ROUND_BRACKET_RIGHT.value
-    )
+    __slots__ = ("_str",)
+
+    base_expression = _L + "%s" + _R
 
     @property
     @abstractmethod
@@ -483,6 +451,8 @@ OperatorChildren = Sequence[T]
 class UnaryOperator(Generic[T], Operator, ABC):
     """A class to represent unary operator."""
 
+    __slots__ = ("f",)
+
     def __init__(self, f: T):
         """
         Instantiate the unary operator over a formula.
@@ -491,31 +461,36 @@ class UnaryOperator(Generic[T], Operator, ABC):
         """
         super().__init__()
         self.f = f
+        self._str = None  # type: Optional[str]
 
     def __str__(self):
         """Get the string representation."""
-        return (
-            str(self.operator_symbol)
-            + Symbols.ROUND_BRACKET_LEFT.value
-            + str(self.f)
-            + Symbols.ROUND_BRACKET_RIGHT.value
-        )
+        if self._str is None:
+            self._str = f"{self.operator_symbol}{_L}{self.f}{_R}"
+        return self._str
 
     def _members(self):
         return self.operator_symbol, self.f
 
+    def _init_args(self) -> tuple:
+        return (self.f,)
+
     def __lt__(self, other):
         """Compare the formula with another formula."""
         return self.f.__lt__(other.f)
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Return the set of symbols."""
-        return cast(Formula, self.f).find_labels()
+        labels = set()  # type: Set[AtomSymbol]
+        _collect_labels(self, labels)
+        return labels
 
 
 class BinaryOperator(Generic[T], Operator, ABC):
     """A generic binary formula."""
 
+    __slots__ = ("formulas",)
+
     def __init__(self, formulas: OperatorChildren):
         """
         Initialize the binary operator.
@@ -525,22 +500,85 @@ class BinaryOperator(Generic[T], Operator, ABC):
         super().__init__()
         assert len(formulas) >= 2
         self.formulas = tuple(formulas)  # type: OperatorChildren
+        self._str = None  # type: Optional[str]
 
     def __str__(self):
         """Return the string representation."""
-        return (
-            "("
-            + (" " + str(self.operator_symbol) + " ").join(map(str, self.formulas))
-            + ")"
-        )
+        if self._str is None:
+            sep = f" {self.operator_symbol} "
+            self._str = f"{_L}{sep.join(map(str, self.formulas))}{_R}"
+        return self._str
 
     def _members(self) -> Tuple[OpSymbol, OperatorChildren]:
         return self.operator_symbol, self.formulas
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _init_args(self) -> tuple:
+        return (self.formulas,)
+
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Return the set of symbols."""
-        return set.union(*map(lambda f: f.find_labels(), self.formulas))
+        labels = set()  # type: Set[AtomSymbol]
+        _collect_labels(self, labels)
+        return labels
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         return type(self)([f.to_nnf() for f in self.formulas])
+
+
+def _collect_labels(root: Formula, out: Set[AtomSymbol]) -> None:
+    """
+    Add the symbols of a formula to a set, without recursion.
+
+    Subformulas whose symbols are already cached are not visited, and a
+    subformula shared by several operators is visited once.
+
+    :param root: the formula to visit.
+    :param out: the set the symbols are added to.
+    """
+    stack = [root]
+    seen = set()  # type: Set[int]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if node._labels is not None:
+            out |= node._labels
+        elif isinstance(node, UnaryOperator):
+            stack.append(node.f)
+        elif isinstance(node, BinaryOperator):
+            stack.extend(node.formulas)
+        else:
+            out |= node.find_labels()
+
+
+def _normalize_operands(root: Formula) -> None:
+    """
+    Compute the NNF of the operands of a formula, bottom-up and without recursion.
+
+    Then '_to_nnf' of the formula finds the NNF of its operands cached, and
+    deep formulas do not recurse through 'to_nnf'. Only the operands of
+    formulas built from the NNF of their operands are visited.
+
+    :param root: the formula whose operands are normalized.
+    """
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if node is root:
+            if visited:
+                continue
+        elif visited or node._nnf is not None:
+            node.to_nnf()
+            continue
+        if not node._nnf_from_operands:
+            continue
+        if isinstance(node, UnaryOperator):
+            operands = (node.f,)  # type: Sequence[Formula]
+        elif isinstance(node, BinaryOperator):
+            operands = node.formulas
+        else:
+            continue
+        stack.append((node, True))
+        stack.extend((f, False) for f in operands if f._nnf is None)
@@ -2,8 +2,9 @@
 
 """Helpers module."""
 
-from abc import ABC, abstractmethod
-from copy import copy
+from abc import ABC, ABCMeta, abstractmethod
+from functools import lru_cache, wraps
+from weakref import WeakValueDictionary, ref
 
 # from itertools import chain, combinations
 # from typing import Iterable, Set, FrozenSet, List
@@ -20,6 +21,8 @@ ParsingError = ValueError("Parsing error.")
 class Hashable(ABC):
     """A base class to represent hashable objects."""
 
+    __slots__ = ("_hash",)
+
     def __init__(self):
         """Initialize."""
         self._hash = None
@@ -30,7 +33,16 @@ class Hashable(ABC):
 
     def __eq__(self, other):
         """Compare."""
+        if other is self:
+            return True
         if type(other) is type(self):
+            if (
+                self._hash is not None
+                and other._hash is not None
+                and self._hash != other._hash
+            ):
+                # both hashes are cached already: no need to compare members
+                return False
             return self._members() == other._members()
         else:
             return False
@@ -43,16 +55,96 @@ class Hashable(ABC):
         return self._hash
 
     def __getstate__(self):
-        """Get the state."""
-        d = copy(self.__dict__)
-        d.pop("_hash")
+        """Get the state, made of both instance dict and slots."""
+        try:
+            # bypass __getattr__, which wrappers forward to the wrapped object
+            d = dict(object.__getattribute__(self, "__dict__"))
+        except AttributeError:
+            d = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name in ("__dict__", "__weakref__"):
+                    continue
+                try:
+                    d[name] = cls.__dict__[name].__get__(self, cls)
+                except AttributeError:
+                    pass
+        d.pop("_hash", None)
         return d
 
     def __setstate__(self, state):
         """Set the state."""
-        self.__dict__ = state
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
         self._hash = None
 
+    def _init_args(self) -> tuple:
+        """Return the arguments that build an equal object through the class."""
+        return ()
+
+    def __reduce_ex__(self, protocol):
+        """Pickle hash-consed objects as a call to their class.
+
+        Hence, unpickling goes through HashConsing and returns the alive equal
+        object, if any; the caches are not pickled, but computed again.
+        """
+        cls = type(self)
+        if not isinstance(cls, HashConsing):
+            return super().__reduce_ex__(protocol)
+        return cls, self._init_args()
+
+
+class HashConsing(ABCMeta):
+    """Metaclass that shares structurally equal instances of its classes.
+
+    Instances are compared by _members(), hence building a formula equal to
+    an alive one returns the existing object, together with its caches.
+    """
+
+    def __init__(cls, *args, **kwargs):
+        """Give each class its own table of alive instances."""
+        super().__init__(*args, **kwargs)
+        cls._instances = WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        """Build an instance, or return the existing equal one."""
+        if not args and not kwargs:
+            # constants (True, False, Last, ...): one instance, kept alive
+            try:
+                return cls.__dict__["_constant"]
+            except KeyError:
+                obj = cls._constant = cls._intern(super().__call__())
+                return obj
+        return cls._intern(super().__call__(*args, **kwargs))
+
+    def build_unshared(cls, *args, **kwargs):
+        """Build a new instance, without looking for an equal alive one."""
+        return super().__call__(*args, **kwargs)
+
+    def _intern(cls, obj):
+        """Return the alive instance equal to obj, registering obj if none."""
+        try:
+            return cls._instances.setdefault(_weak_key(obj._members()), obj)
+        except TypeError:
+            # unhashable members: do not share
+            return obj
+
+
+def _weak_key(members):
+    """Refer to the members weakly, to key the table of alive instances.
+
+    A key holding the operands strongly would keep them alive, together with
+    whatever they reach, e.g. their cached negation and closure, which refer
+    back to them: formulas would never be collected.
+    """
+    if type(members) is tuple:
+        return tuple(_weak_key(m) for m in members)
+    try:
+        return ref(members)
+    except TypeError:
+        # e.g. strings
+        return members
+
 
 class Wrapper(Hashable):
     """Wrap other objects and expose the same interface.
@@ -60,15 +152,21 @@ class Wrapper(Hashable):
     This helper class can be subclassed to create a constant view on wrapped
     objects, exposing the same interface.
     This is an immutable object: either add members to _mutable list, or
-    modify them through __dict__.
+    set them once through _init_slot.
     """
 
+    __slots__ = ("_Wrapper__obj",)
+
     _mutable = ["_hash"]
 
     def __init__(self, obj):
         """Initialize: save the wrapped object."""
         super().__init__()
-        self.__dict__["_Wrapper__obj"] = obj
+        self._init_slot("_Wrapper__obj", obj)
+
+    def _init_slot(self, name, value):
+        """Set an attribute, bypassing immutability. Only for initialization."""
+        object.__setattr__(self, name, value)
 
     def __str__(self):
         """Just forward to obj."""
@@ -85,7 +183,7 @@ class Wrapper(Hashable):
     def __setattr__(self, attr, value):
         """If immutable, raises an error."""
         if attr in self._mutable:
-            self.__dict__[attr] = value
+            object.__setattr__(self, attr, value)
         else:
             raise AttributeError("Can't modify: immutable object.")
 
@@ -139,8 +237,9 @@ class Wrapper(Hashable):
 #         yield c
 
 
+@lru_cache(maxsize=None)
 def new_var(prev_var: str) -> str:
-    """Compute next variable."""
+    """Compute next variable (cached, so equal names are the same string)."""
     if prev_var == "0" or prev_var == "max($)":
         return "v_1"
     else:
@@ -149,6 +248,56 @@ def new_var(prev_var: str) -> str:
         return "_".join(s)
 
 
+@lru_cache(maxsize=None)
+def next_instant(v: str) -> str:
+    """Compute the MONA term of the instant following v."""
+    return "1" if v == "0" else f"{v}+1"
+
+
+def memoize_mona(method):
+    """
+    Cache the MONA encoding of a formula for each variable.
+
+    Formulas are immutable, hence the encoding only depends on the formula
+    and on the variable of evaluation.
+
+    :param method: a MONA encoding method, e.g. 'to_mona' or 'to_mona_s'.
+    :return: the memoized method.
+    """
+    name = method.__name__
+    (default,) = method.__defaults__
+
+    @wraps(method)
+    def wrapper(self, v=default):
+        cache = self._mona_cache
+        if cache is None:
+            cache = self._mona_cache = {}
+        key = (name, v)
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = method(self, v)
+        return result
+
+    return wrapper
+
+
+def memoize_program(method):
+    """
+    Cache the text of a MONA program on the program instance.
+
+    :param method: the 'mona_program' method of a MONA program class.
+    :return: the memoized method.
+    """
+
+    @wraps(method)
+    def wrapper(self):
+        if self._program_cache is None:
+            self._program_cache = method(self)
+        return self._program_cache
+
+    return wrapper
+
+
 def sym2regexp(sym: Symbols):
     """Transform a symbol to regex."""
     s = sym.value
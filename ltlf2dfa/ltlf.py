@@ -3,7 +3,7 @@
 """This module contains the implementation of Linear Temporal Logic on finite traces."""
 
 from abc import abstractmethod, ABC
-from typing import Set, Optional, Any
+from typing import Callable, Dict, List, Sequence, Set, FrozenSet, Optional, Tuple, Any
 import re
 
 from ltlf2dfa.base import (
@@ -18,41 +18,252 @@ from ltlf2dfa.ltlf2dfa import to_dfa_sm
 #from ltlf2dfa.ltlf2dfa import to_dfa_seq
 from ltlf2dfa.pl import PLAtomic
 from ltlf2dfa.symbols import Symbols, OpSymbol
-from ltlf2dfa.helpers import new_var
+from ltlf2dfa.helpers import HashConsing, new_var, next_instant, memoize_mona
 
-from sympy import symbols, And, Not, Or, Implies, simplify
+from sympy import Symbol, symbols, And, Not, Or, Implies, simplify, true, false
 
-class LTLfFormula(Formula, ABC):
+# the atoms v0, v1, ... of temporal logic programs, shared by all programs
+_TLP_VARS = []  # type: List[PLAtomic]
+
+
+def closure_index(formulas: Sequence["LTLfFormula"]) -> Dict["LTLfFormula", int]:
+    """
+    Map each formula of a closure to its position, i.e. to its state index.
+
+    :param formulas: the ordered closure formulas.
+    :return: the map from formulas to positions, to be passed to 'delta'.
+    """
+    return {f: i for i, f in enumerate(formulas)}
+
+
+_STATE_SYMBOLS = []  # type: List[Symbol]
+
+
+def _s(i: int) -> Symbol:
+    """Return the i-th state symbol, creating the missing ones."""
+    while len(_STATE_SYMBOLS) <= i:
+        _STATE_SYMBOLS.append(symbols("s" + str(len(_STATE_SYMBOLS))))
+    return _STATE_SYMBOLS[i]
+
+
+def _state_symbol(closure, f):
+    """Return the state symbol of f, given the closure list or its index map."""
+    return _s(closure[f] if isinstance(closure, dict) else closure.index(f))
+
+
+def _and(*ops):
+    """Conjoin delta results, building one flat sympy And only if needed."""
+    args = []
+    for a in ops:
+        if a is False or a is false:
+            return False
+        if a is not True and a is not true:
+            args.append(a)
+    if not args:
+        return True
+    return args[0] if len(args) == 1 else And(*args)
+
+
+def _or(*ops):
+    """Disjoin delta results, building one flat sympy Or only if needed."""
+    args = []
+    for a in ops:
+        if a is True or a is true:
+            return True
+        if a is not False and a is not false:
+            args.append(a)
+    if not args:
+        return False
+    return args[0] if len(args) == 1 else Or(*args)
+
+
+def _not(a):
+    """Negate a delta result, building a sympy Not only if needed."""
+    if a is True or a is true:
+        return False
+    if a is False or a is false:
+        return True
+    return Not(a)
+
+
+def _equiv(a, b):
+    """Build the equivalence of two delta results, simplifying constants."""
+    if a is True or a is true:
+        return b
+    if a is False or a is false:
+        return _not(b)
+    return _or(_and(a, b), _and(_not(a), _not(b)))
+
+
+def _flat_nnf(cls, formulas, unit, zero):
+    """
+    Build the NNF of an n-ary And or Or from the NNF of its operands.
+
+    Operands of the same kind are flattened, duplicates and the unit are
+    dropped, and the zero absorbs the whole formula.
+    """
+    flat = {}  # type: Dict[LTLfFormula, None]
+    for f in formulas:
+        for g in f.formulas if type(f) is cls else (f,):
+            if g is zero:
+                return zero
+            if g is not unit:
+                flat[g] = None
+    if len(flat) > 1:
+        return cls(list(flat))
+    return next(iter(flat), unit)
+
+
+def _unnest(cls, first, f):
+    """
+    Build the NNF of F f (as true U f) or G f (as false R f).
+
+    Both are idempotent, hence F F f is F f and G G f is G f.
+
+    :param cls: LTLfUntil or LTLfRelease.
+    :param first: the constant operand, True for Until and False for Release.
+    :param f: the NNF of the operand.
+    """
+    if type(f) is cls and len(f.formulas) == 2 and f.formulas[0] is first:
+        return f
+    return cls([first, f])
+
+
+def _is_constant(f) -> bool:
+    """Tell whether f is the True or the False formula."""
+    return f is LTLfTrue() or f is LTLfFalse()
+
+
+def _no_closure(self):
+    """Stand for '_closure' in the past operators, which have none yet."""
+    raise NotImplementedError(f"closure of {type(self).__name__} is not implemented")
+
+
+def _always_equiv(nv, body):
+    """
+    Build the axiom G(nv <-> body) of a temporal logic program.
+
+    Axioms are unique to their fresh atom, hence they are not hash-consed.
+    """
+    return LTLfAlways.build_unshared(LTLfEquivalence.build_unshared([nv, body]))
+
+
+class LTLfFormula(Formula, ABC, metaclass=HashConsing):
     """A class for the LTLf formula."""
-    
-    def closure(self):
+
+    # weak references are needed by hash-consing
+    __slots__ = ("__weakref__",)
+
+    # whether 'closure' is implemented, to check before calling it
+    supports_closure = True
+
+    def __init__(self):
+        """Initialize the LTLf formula."""
+        super().__init__()
+        self._closure_set = None  # type: Optional[FrozenSet[LTLfFormula]]
+        self._not = None  # type: Optional[LTLfNot]
+
+    def closure(self) -> FrozenSet["LTLfFormula"]:
+        """
+        Return the closure of the formula.
+
+        Formulas are immutable, hence the result is computed once and cached.
+
+        :return: the set of subformulas and their negations.
+        """
+        if self._closure_set is None:
+            self._closure_set = frozenset(self._closure())
+        return self._closure_set
+
+    def _closure(self):
         return set([])
 
+    def _negated(self) -> "LTLfNot":
+        """Return LTLfNot(self), built once."""
+        if self._not is None:
+            self._not = LTLfNot(self)
+        return self._not
 
-    def delta(self,s,X):
-        return None
+    def delta(self, closure, X):
+        """
+        Compute the transition of the formula on the interpretation X.
+
+        :param closure: the closure list, or its index map (see closure_index).
+        :param X: the interpretation, i.e. the set of true labels.
+        :return: the sympy formula over the state symbols.
+        """
+        return self._delta_function(closure)(X)
+
+    def delta_function(self, closure) -> Callable[[Set[str]], Any]:
+        """
+        Build 'delta' as a function of the interpretation only.
+
+        Dispatch on subformulas and state symbol lookups are resolved once.
+        Moreover, the result only depends on the labels of the formula and on
+        'last', so it is cached on the bitmask of those found in X: sweeping
+        all the interpretations builds each sympy result once.
+
+        :param closure: the closure list, or its index map (see closure_index).
+        :return: the function mapping X to delta(closure, X).
+        """
+        index = closure if isinstance(closure, dict) else closure_index(closure)
+        delta = self._delta_function(index)
+        bits = [(a, 2 << i) for i, a in enumerate(sorted(self.find_labels()))]
+        cache = {}  # type: Dict[int, Any]
+
+        def function(X):
+            key = int("last" in X)
+            for a, bit in bits:
+                if a in X:
+                    key |= bit
+            try:
+                return cache[key]
+            except KeyError:
+                result = cache[key] = delta(X)
+                return result
+
+        return function
+
+    def _delta_function(self, index: Dict["LTLfFormula", int]):
+        return lambda X: None
 
     def new_var2(f,exv):
         """Compute next variable."""
-        v2 = PLAtomic("v" + str(len(exv)))
-        exv[f] = v2
+        i = len(exv)
+        while len(_TLP_VARS) <= i:
+            _TLP_VARS.append(PLAtomic._unchecked("v" + str(len(_TLP_VARS))))
+        v2 = exv[f] = _TLP_VARS[i]
         return v2
     
-    def assigned_variable(self,f,exv):
-        if f in exv:
-            return exv[f]
-        else:
-            return None
-        
     def gen_tlp(self):
+        """
+        Transform the formula into a temporal logic program.
+
+        Each subformula is given a fresh atom, in pre-order, and the axioms
+        defining it are added once all its subformulas have one.
+        The traversal is iterative, so deep formulas do not hit the
+        recursion limit.
+
+        :return: the set of axioms, plus the atom representing the formula.
+        """
         exv = {}
         df = set([])
-        v = self._to_tlp(exv,df)
-        df.add(v)
+        stack = [(self, None)]
+        while stack:
+            f, children = stack.pop()
+            if children is None:
+                children = f._tlp_children()
+                if children is None or f in exv:
+                    continue
+                f.new_var2(exv)
+                stack.append((f, children))
+                stack.extend((c, None) for c in reversed(children))
+            else:
+                f._tlp_axioms(exv[f], [exv.get(c, c) for c in children], df)
+        df.add(exv.get(self, self))
         return df
         
-
-    def to_nnf(self) -> "LTLfFormula":
+    def _to_nnf(self) -> "LTLfFormula":
         """Convert an LTLf formula in NNF."""
         return self
 
@@ -78,11 +289,32 @@ class LTLfFormula(Formula, ABC):
         :return: a string.
         """
     
-    def _to_tlp(self,v,df):
+    def _tlp_children(self):
+        """
+        Return the subformulas the temporal logic program of the formula is built on.
+
+        :return: the subformulas, or None if the formula represents itself.
+        """
+        return None
+
+    def _tlp_body(self, vs):
+        """
+        Return the formula the fresh atom of the formula is equivalent to.
+
+        :param vs: the atoms representing the subformulas from '_tlp_children'.
+        :return: the operator of the formula applied to the atoms.
+        """
+
+    def _tlp_axioms(self, nv, vs, df):
         """
-        transform a formula into a temporal logic program
-        :return a (fresh) propositional atom label representing the formula 
+        Add the axioms defining the fresh atom of the formula.
+
+        :param nv: the fresh atom representing the formula.
+        :param vs: the atoms representing the subformulas from '_tlp_children'.
+        :param df: the set of axioms.
         """
+        df.add(_always_equiv(nv, self._tlp_body(vs)))
+
     def to_ldlf(self):
         """
         Tranform the formula into an equivalent LDLf formula.
@@ -106,47 +338,43 @@ class LTLfFormula(Formula, ABC):
 class LTLfUnaryOperator(UnaryOperator[LTLfFormula], LTLfFormula, ABC):
     """A unary operator for LTLf."""
 
+    __slots__ = ()
+
 
 class LTLfBinaryOperator(BinaryOperator[LTLfFormula], LTLfFormula, ABC):
     """A binary operator for LTLf."""
 
+    __slots__ = ()
+
 
 class LTLfAtomic(AtomicFormula, LTLfFormula):
     """Class for LTLf atomic formulas."""
 
+    __slots__ = ()
+
     name_regex = re.compile(r"[a-z][a-z0-9_]*")
-    def delta(self,l,X):
-        if self.s in X :
-            return True
-        else:
-            return False
 
-    def closure(self):
-        return set([self,LTLfNot(self)])
+    def _delta_function(self, index):
+        s = self.s
+        return lambda X: s in X
+
+    def _closure(self):
+        return set([self,self._negated()])
 
     def negate(self):
         """Negate the formula."""
-        return LTLfNot(self)
+        return self._negated()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
-        return PLAtomic(self.s).find_labels()
+        return {str(self.s)}
 
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf atomic formula."""
-        if v != "0":
-            return "({} in {})".format(v, self.s.upper())
-        else:
-            return "(0 in {})".format(self.s.upper())
+        return f"({v} in {self.s.upper()})"
 
     def to_mona_s(self,v="0") -> str:
-        if v != "0":
-            return "({0} in {1}_p)".format(v, self.s.upper())
-        else:
-            return "(0 in {}_p)".format(self.s.upper())
-
-    def _to_tlp(self,v,df):
-        return self
+        return f"({v} in {self.s.upper()}_p)"
 
     # def to_ldlf(self):
     #     """Convert the formula to LDLf."""
@@ -157,21 +385,27 @@ class LTLfAtomic(AtomicFormula, LTLfFormula):
 class LTLfTrue(LTLfAtomic):
     """Class for the LTLf True formula."""
 
-    def delta(self,l,X):
-        return True
+    __slots__ = ()
+
+    def _delta_function(self, index):
+        return lambda X: True
 
-    def closure(self):
+    def _closure(self):
         return set([self])
 
     def __init__(self):
         """Initialize the formula."""
-        super().__init__(Symbols.TRUE.value)
+        self._init_unchecked(Symbols.TRUE.value)
+
+    def _init_args(self) -> tuple:
+        # the constant takes no arguments: unpickling returns the singleton
+        return ()
 
     def negate(self):
         """Negate the formula."""
         return LTLfFalse()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -182,9 +416,6 @@ class LTLfTrue(LTLfAtomic):
     def to_mona_s(self,v="0") -> str:
         return Symbols.TRUE.value
 
-    def _to_tlp(self,v,df):
-        return self
-
     # def to_ldlf(self):
     #     """Convert the formula to LDLf."""
     #     return LDLfDiamond(RegExpPropositional(PLTrue()), LDLfLogicalTrue())
@@ -193,21 +424,27 @@ class LTLfTrue(LTLfAtomic):
 class LTLfFalse(LTLfAtomic):
     """Class for the LTLf False formula."""
 
-    def delta(self,l,X):
-        return False
+    __slots__ = ()
+
+    def _delta_function(self, index):
+        return lambda X: False
 
-    def closure(self):
+    def _closure(self):
         return set([self])
 
     def __init__(self):
         """Initialize the formula."""
-        super().__init__(Symbols.FALSE.value)
+        self._init_unchecked(Symbols.FALSE.value)
+
+    def _init_args(self) -> tuple:
+        # the constant takes no arguments: unpickling returns the singleton
+        return ()
 
     def negate(self):
         """Negate the formula."""
         return LTLfTrue()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -218,25 +455,23 @@ class LTLfFalse(LTLfAtomic):
     def to_mona_s(self,v="0") -> str:
         return Symbols.FALSE.value
 
-    def _to_tlp(self,v,df):
-        return self
-
 
 class LTLfNot(LTLfUnaryOperator):
     """Class for the LTLf not formula."""
 
-    def delta(self,l,X):
-        return Not(self.f.delta(l,X))
+    __slots__ = ()
 
-    def closure(self):
-        return set([self,self.f]).union(self.f.closure())
+    operator_symbol = Symbols.NOT.value  # type: OpSymbol
+    _nnf_from_operands = False
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.NOT.value
+    def _delta_function(self, index):
+        g = self.f._delta_function(index)
+        return lambda X: _not(g(X))
 
-    def to_nnf(self) -> LTLfFormula:
+    def _closure(self):
+        return set([self,self.f]).union(self.f.closure())
+
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         if not isinstance(self.f, AtomicFormula):
             return self.f.negate().to_nnf()
@@ -247,252 +482,261 @@ class LTLfNot(LTLfUnaryOperator):
         """Negate the formula."""
         return self.f
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Not formula."""
-        return "~({})".format(self.f.to_mona(v))
+        return f"~({self.f.to_mona(v)})"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
-        return "(~{} & ~{})".format(self.f.to_mona_s(v), self.f.to_mona(v))
+        a_s, a = self.f.to_mona_s(v), self.f.to_mona(v)
+        return f"(~{a_s} & ~{a})"
     # def to_ldlf(self):
     #     """Convert the formula to LDLf."""
     #     return LDLfNot(self.f.to_ldlf())
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self, v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
-        sf = self.assigned_variable(self.f,v)
-        if sf == None:
-            sf = self.f._to_tlp(v,df)
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfNot(sf)])))
-        return nv
+    def _tlp_children(self):
+        return (self.f,)
+
+    def _tlp_body(self, vs):
+        return LTLfNot(vs[0])
 
 class LTLfAnd(LTLfBinaryOperator):
     """Class for the LTLf And formula."""
 
-    def delta(self,l,X):
-        v = True
-        for i in self.formulas:
-            v = And(v,i.delta(l,X))
-        return v
+    __slots__ = ()
 
+    operator_symbol = Symbols.AND.value  # type: OpSymbol
 
-    def closure(self):
-        s = set([self,LTLfNot(self)])
+    def _delta_function(self, index):
+        gs = tuple(i._delta_function(index) for i in self.formulas)
+        return lambda X: _and(*[g(X) for g in gs])
+
+    def _closure(self):
+        s = {self, self._negated()}
         for i in self.formulas:
-            s=s.union(i.closure())
+            s |= i.closure()
         return s
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.AND.value
+
+    def _to_nnf(self) -> LTLfFormula:
+        """Transform to NNF, flattening nested Ands."""
+        return _flat_nnf(
+            LTLfAnd, [f.to_nnf() for f in self.formulas], LTLfTrue(), LTLfFalse()
+        )
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
         return LTLfOr([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf And formula."""
-        return "({})".format(" & ".join([f.to_mona(v) for f in self.formulas]))
+        return "(" + " & ".join([f.to_mona(v) for f in self.formulas]) + ")"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
-        return "({})".format(" & ".join([f.to_mona_s(v) for f in self.formulas]))
+        return "(" + " & ".join([f.to_mona_s(v) for f in self.formulas]) + ")"
     # def to_ldlf(self):
     #     """Convert the formula to LDLf."""
     #     return LDLfAnd([f.to_ldlf() for f in self.formulas])
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+    def _tlp_children(self):
+        return self.formulas
 
-        sf = []
-        for i in self.formulas:
-            cf = self.assigned_variable(i,v)
-            if cf == None:
-                cf = i._to_tlp(v,df)
-            sf.append(cf)
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfAnd(sf)])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfAnd(vs)
 
 class LTLfOr(LTLfBinaryOperator):
     """Class for the LTLf Or formula."""
-    
-    def delta(self,l,X):
-        v = False
-        for i in self.formulas:
-            v = Or(v,i.delta(l,X))
-        return v
 
+    __slots__ = ()
+
+    operator_symbol = Symbols.OR.value  # type: OpSymbol
+
+    def _delta_function(self, index):
+        gs = tuple(i._delta_function(index) for i in self.formulas)
+        return lambda X: _or(*[g(X) for g in gs])
 
-    def closure(self):
-        s = set([self,LTLfNot(self)])
+    def _closure(self):
+        s = {self, self._negated()}
         for i in self.formulas:
-            s=s.union(i.closure())
+            s |= i.closure()
         return s
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.OR.value
+    def _to_nnf(self) -> LTLfFormula:
+        """Transform to NNF, flattening nested Ors."""
+        return _flat_nnf(
+            LTLfOr, [f.to_nnf() for f in self.formulas], LTLfFalse(), LTLfTrue()
+        )
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
         return LTLfAnd([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Or formula."""
-        return "({})".format(" | ".join([f.to_mona(v) for f in self.formulas]))
+        return "(" + " | ".join([f.to_mona(v) for f in self.formulas]) + ")"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
-        return "({})".format(" | ".join([f.to_mona_s(v) for f in self.formulas]))
+        return "(" + " | ".join([f.to_mona_s(v) for f in self.formulas]) + ")"
     # def to_ldlf(self):
     #     """Convert LTLf formula to LDLf."""
     #     return LDLfOr([f.to_ldlf() for f in self.formulas])
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+    def _tlp_children(self):
+        return self.formulas
 
-        sf = []
-        for i in self.formulas:
-            cf = self.assigned_variable(i,v)
-            if cf == None:
-                cf = i._to_tlp(v,df)
-            sf.append(cf)
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfOr(sf)])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfOr(vs)
 
 class LTLfImplies(LTLfBinaryOperator):
     """Class for the LTLf Implication formula."""
-    def delta(self,l,X):
-        first, second = self.formulas[0:2]
-        return Or(Not(first.delta(l,X)),second.delta(l,X))
 
-    def closure(self):
+    __slots__ = ()
+
+    operator_symbol = Symbols.IMPLIES.value  # type: OpSymbol
+
+    def _delta_function(self, index):
+        first, second = (i._delta_function(index) for i in self.formulas[0:2])
+
+        def delta(X):
+            a = first(X)
+            if a is False or a is false:
+                return True
+            return _or(_not(a), second(X))
+
+        return delta
+
+    def _closure(self):
         first, second = self.formulas[0:2]
         return LTLfOr([LTLfNot(first),second]).closure()
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.IMPLIES.value
-
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
         return self.to_nnf().negate()
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         first, second = self.formulas[0:2]
-        final_formula = LTLfOr([LTLfNot(first).to_nnf(), second.to_nnf()])
+        neg_first, second = LTLfNot(first).to_nnf(), second.to_nnf()
+        final_formula = LTLfOr([neg_first, second])
+        # the negation of the formula built so far, kept along so that
+        # each step does not negate the whole prefix again
+        neg_final = LTLfAnd([neg_first.negate(), second.negate()])
         for subformula in self.formulas[2:]:
-            final_formula = LTLfOr(
-                [LTLfNot(final_formula).to_nnf(), subformula.to_nnf()]
+            subformula = subformula.to_nnf()
+            final_formula, neg_final = (
+                LTLfOr([neg_final, subformula]),
+                LTLfAnd([final_formula, subformula.negate()]),
             )
         return final_formula
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Implication formula."""
         f,g = self.formulas[0:2]
-        return "({} => {})".format(f.to_mona(v),g.to_mona(v))
-
+        a, b = f.to_mona(v), g.to_mona(v)
+        return f"({a} => {b})"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         f,g = self.formulas[0:2]
-        return "(({} => {}) & ({} => {}))".format(f.to_mona(v), g.to_mona(v), f.to_mona_s(v), g.to_mona_s(v))
-
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+        a, b = f.to_mona(v), g.to_mona(v)
+        a_s, b_s = f.to_mona_s(v), g.to_mona_s(v)
+        return f"(({a} => {b}) & ({a_s} => {b_s}))"
 
+    def _tlp_children(self):
+        return self.formulas[0:2]
 
-        f1 = self.assigned_variable(self.formulas[0],v)
-        if f1 == None:
-            f1 = self.formulas[0]._to_tlp(v,df)
-        f2 = self.assigned_variable(self.formulas[1],v)
-        if f2 == None:
-           f2 = self.formulas[1]._to_tlp(v,df)
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfImplies([f1,f2])])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfImplies(vs)
 
 class LTLfEquivalence(LTLfBinaryOperator):
     """Class for the LTLf Equivalente formula."""
 
-    def delta(self,l,X):
-        f,g = self.formulas[0:2]
-        f,g = f.delta(l,X), g.delta(l,X)
-        return Or(And(f,g),And(Not(f),Not(g)))
+    __slots__ = ()
 
-    def closure(self):
+    operator_symbol = Symbols.EQUIVALENCE.value  # type: OpSymbol
+
+    def _delta_function(self, index):
+        df, dg = (i._delta_function(index) for i in self.formulas[0:2])
+
+        def delta(X):
+            return _equiv(df(X), dg(X))
+
+        return delta
+
+    def _closure(self):
         f,g = self.formulas[0:2]
-        return set([LTLfNot(self),self]).union(f.closure()).union(g.closure())
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.EQUIVALENCE.value
+        s = {self._negated(), self}
+        s |= f.closure()
+        s |= g.closure()
+        return s
 
-    def to_nnf(self) -> LTLfFormula:
-        """Transform to NNF."""
+    def _nnf_operands(self):
+        """Return the NNF of the operands and the NNF of their negations."""
         fs = self.formulas
-        pos = LTLfAnd(fs)
-        neg = LTLfAnd([LTLfNot(f) for f in fs])
-        res = LTLfOr([pos, neg]).to_nnf()
-        return res
+        return [f.to_nnf() for f in fs], [f._negated().to_nnf() for f in fs]
+
+    def _to_nnf(self) -> LTLfFormula:
+        """Transform to NNF: all the operands hold, or none does."""
+        pos, neg = self._nnf_operands()
+        true, false = LTLfTrue(), LTLfFalse()
+        return _flat_nnf(
+            LTLfOr,
+            [_flat_nnf(LTLfAnd, pos, true, false), _flat_nnf(LTLfAnd, neg, true, false)],
+            false,
+            true,
+        )
 
     def negate(self) -> LTLfFormula:
-        """Negate the formula."""
-        return self.to_nnf().negate()
-
+        """Negate the formula, in NNF: some operand fails, and some holds."""
+        pos, neg = self._nnf_operands()
+        true, false = LTLfTrue(), LTLfFalse()
+        return _flat_nnf(
+            LTLfAnd,
+            [_flat_nnf(LTLfOr, neg, false, true), _flat_nnf(LTLfOr, pos, false, true)],
+            true,
+            false,
+        )
+
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         f,g = self.formulas[0:2]
-        return "({} <=> {})".format(f.to_mona(v),g.to_mona(v))
+        a, b = f.to_mona(v), g.to_mona(v)
+        return f"({a} <=> {b})"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         f,g = self.formulas[0:2]
-        return "({} <=> {}) &  ({} <=> {})".format(f.to_mona(v),g.to_mona(v), f.to_mona_s(v), g.to_mona_s(v))
-
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+        a, b = f.to_mona(v), g.to_mona(v)
+        a_s, b_s = f.to_mona_s(v), g.to_mona_s(v)
+        return f"({a} <=> {b}) &  ({a_s} <=> {b_s})"
 
+    def _tlp_children(self):
+        return self.formulas[0:2]
 
-        f1 = self.assigned_variable(self.formulas[0],v)
-        if f1 == None:
-            f1 = self.formulas[0]._to_tlp(v,df)
-        f2 = self.assigned_variable(self.formulas[1],v)
-        if f2 == None:
-            f2 = self.formulas[1]._to_tlp(v,df)
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfEquivalence([f1,f2])])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfEquivalence(vs)
 
 
 class LTLfNext(LTLfUnaryOperator):
     """Class for the LTLf Next formula."""
 
-    def delta(self,l,X):
-        if 'last' in X:
-            return False
-        else:
-            return symbols("s" + str(l.index(self.f)))
+    __slots__ = ()
 
+    operator_symbol = Symbols.NEXT.value  # type: OpSymbol
 
-    def closure(self):
-        return set([self, LTLfNot(self)]).union(self.f.closure())
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.NEXT.value
+    def _delta_function(self, index):
+        s = _state_symbol(index, self.f)
+        return lambda X: False if "last" in X else s
 
-    def to_nnf(self) -> LTLfFormula:
+    def _closure(self):
+        return set([self, self._negated()]).union(self.f.closure())
+
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return LTLfNext(self.f.to_nnf())
 
@@ -500,13 +744,11 @@ class LTLfNext(LTLfUnaryOperator):
         """Negate the formula."""
         return LTLfWeakNext(self.f.negate())
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Next formula."""
         ex_var = new_var(v)
-        if v != "0":
-            return "(ex1 {0}: {0}={1}+1 & {2})".format(ex_var, v, self.f.to_mona(ex_var))
-        else:
-            return "(ex1 {0}: {0}=1 & {1})".format(ex_var, self.f.to_mona(ex_var))
+        return f"(ex1 {ex_var}: {ex_var}={next_instant(v)} & {self.f.to_mona(ex_var)})"
 
     # def to_ldlf(self):
     #     """Convert the formula to LDLf."""
@@ -515,46 +757,38 @@ class LTLfNext(LTLfUnaryOperator):
     #         LDLfAnd([self.f.to_ldlf(), LDLfNot(LDLfEnd())]),
     #     )
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         ex_var = new_var(v)
-        if v != "0":
-            return "(ex1 {0}: {0}={1}+1 & {2})".format(ex_var, v, self.f.to_mona_s(ex_var))
-        else:
-            return "(ex1 {0}: {0}=1 & {1})".format(ex_var, self.f.to_mona_s(ex_var))
+        return f"(ex1 {ex_var}: {ex_var}={next_instant(v)} & {self.f.to_mona_s(ex_var)})"
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+    def _tlp_children(self):
+        return (self.f,)
 
-        f1 = self.assigned_variable(self.f,v)
-        if f1 == None:
-            f1 = self.f._to_tlp(v,df)
+    def _tlp_body(self, vs):
+        return LTLfNext(vs[0])
 
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfNext(f1)])))
-        df.add(LTLfAlways(LTLfImplies([LTLfLast(),LTLfNot(nv)])))
-        return nv
+    def _tlp_axioms(self, nv, vs, df):
+        super()._tlp_axioms(nv, vs, df)
+        df.add(LTLfAlways.build_unshared(LTLfImplies.build_unshared([LTLfLast(), LTLfNot(nv)])))
 
 
 
 class LTLfWeakNext(LTLfUnaryOperator):
     """Class for the LTLf Weak Next formula."""
 
-    def delta(self,l,X):
-        if 'last' in X:
-            return True
-        else:
-            return symbols("s" + str(l.index(self.f)))
+    __slots__ = ()
+
+    operator_symbol = Symbols.WEAK_NEXT.value  # type: OpSymbol
 
-    def closure(self):
-        return set([self, LTLfNot(self)]).union(self.f.closure())
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.WEAK_NEXT.value
+    def _delta_function(self, index):
+        s = _state_symbol(index, self.f)
+        return lambda X: True if "last" in X else s
 
-    def to_nnf(self) -> LTLfFormula:
+    def _closure(self):
+        return set([self, self._negated()]).union(self.f.closure())
+
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return LTLfWeakNext(self.f.to_nnf())
 
@@ -562,317 +796,271 @@ class LTLfWeakNext(LTLfUnaryOperator):
         """Negate the formula."""
         return LTLfNext(self.f.negate())
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf WeakNext formula."""
         ex_var = new_var(v)
-        if v != "0":
-            return "(({1} = max($)) | (ex1 {0}: {0}={1}+1 & {2}))".format(
-                ex_var, v, self.f.to_mona(ex_var)
-            )
-        else:
-            return "((0 = max($)) | (ex1 {0}: {0}=1 & {1}))".format(
-                ex_var, self.f.to_mona(ex_var)
-            )
+        return f"(({v} = max($)) | (ex1 {ex_var}: {ex_var}={next_instant(v)} & {self.f.to_mona(ex_var)}))"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         """Return the MONA encoding of an LTLf WeakNext formula."""
         ex_var = new_var(v)
-        if v != "0":
-            return "(({1} = max($)) | (ex1 {0}: {0}={1}+1 & {2}))".format(
-                ex_var, v, self.f.to_mona_s(ex_var)
-            )
-        else:
-            return "((0 = max($)) | (ex1 {0}: {0}=1 & {1}))".format(
-                ex_var, self.f.to_mona_s(ex_var)
-            )
+        return f"(({v} = max($)) | (ex1 {ex_var}: {ex_var}={next_instant(v)} & {self.f.to_mona_s(ex_var)}))"
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+    def _tlp_children(self):
+        return (self.f,)
 
-        f1 = self.assigned_variable(self.f,v)
-        if f1 == None:
-            f1 = self.f._to_tlp(v,df)
+    def _tlp_body(self, vs):
+        return LTLfWeakNext(vs[0])
 
-        df.add(LTLfAlways(LTLfEquivalence([nv,LTLfWeakNext(f1)])))
-        df.add(LTLfAlways(LTLfImplies([LTLfLast(),nv])))
-        return nv
+    def _tlp_axioms(self, nv, vs, df):
+        super()._tlp_axioms(nv, vs, df)
+        df.add(LTLfAlways.build_unshared(LTLfImplies.build_unshared([LTLfLast(), nv])))
 
 
 class LTLfUntil(LTLfBinaryOperator):
     """Class for the LTLf Until formula."""
 
+    __slots__ = ()
 
-    def delta(self,l,X): #we should be able to manage the ords regarding last      
-        f1 = self.formulas[0].delta(l,X)
-        f2 = self.formulas[1].delta(l,X)
-        if 'last' in X:
-            return f2
-        else: 
-            return Or(f2,And(f1,symbols("s" + str(l.index(self)))))
+    operator_symbol = Symbols.UNTIL.value  # type: OpSymbol
 
+    def _delta_function(self, index):
+        d1, d2 = (i._delta_function(index) for i in self.formulas[0:2])
+        s = _state_symbol(index, self)
 
-    def closure(self):
-        s = set([self, LTLfNot(self)])
-        s = s.union(self.formulas[0].closure())
-        s = s.union(self.formulas[1].closure())
-        return s
+        def delta(X):
+            f2 = d2(X)
+            if "last" in X or f2 is True or f2 is true:
+                return f2
+            return _or(f2, _and(d1(X), s))
 
+        return delta
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.UNTIL.value
+    def _closure(self):
+        s = {self, self._negated()}
+        s |= self.formulas[0].closure()
+        s |= self.formulas[1].closure()
+        return s
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform to NNF."""
-        return LTLfUntil([f.to_nnf() for f in self.formulas])
+        fs = [f.to_nnf() for f in self.formulas]
+        if len(fs) == 2 and fs[0] is LTLfTrue():
+            return _unnest(LTLfUntil, *fs)
+        return LTLfUntil(fs)
 
     def negate(self):
         """Negate the formula."""
         return LTLfRelease([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Until formula."""
         ex_var = new_var(v)
         all_var = new_var(ex_var)
         f1 = self.formulas[0].to_mona(v=all_var)
         f2 = self.formulas[1].to_mona(v=ex_var)
-        return "(ex1 {0}: {1}<={0}&{0}<=max($) & {2} & (all1 {3}: {1}<={3}&{3}<{0} => {4}))".format(ex_var, v, f2, all_var, f1)
+        return (
+            f"(ex1 {ex_var}: {v}<={ex_var}&{ex_var}<=max($) & {f2}"
+            f" & (all1 {all_var}: {v}<={all_var}&{all_var}<{ex_var} => {f1}))"
+        )
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         """Return the MONA encoding of an LTLf Until formula."""
         ex_var = new_var(v)
         all_var = new_var(ex_var)
         f1 = self.formulas[0].to_mona_s(v=all_var)
         f2 = self.formulas[1].to_mona_s(v=ex_var)
-        return "(ex1 {0}: {1}<={0}&{0}<=max($) & {2} & (all1 {3}: {1}<={3}&{3}<{0} => {4}))".format(ex_var, v, f2, all_var, f1)
+        return (
+            f"(ex1 {ex_var}: {v}<={ex_var}&{ex_var}<=max($) & {f2}"
+            f" & (all1 {all_var}: {v}<={all_var}&{all_var}<{ex_var} => {f1}))"
+        )
 
+    def _tlp_children(self):
+        return (self.formulas[0], self.formulas[1], LTLfNext(self))
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
-
-        f1 = self.assigned_variable(self.formulas[0],v)
-        if f1 == None:
-            f1 = self.formulas[0]._to_tlp(v,df)
-
-        f2 = self.assigned_variable(self.formulas[1],v)
-        if f2 == None:
-            f2 = self.formulas[1]._to_tlp(v,df)
-
-        f3 = self.assigned_variable(LTLfNext(self),v)
-        if f3 == None:
-            f3 = LTLfNext(self)._to_tlp(v,df)
-
-        df.add(LTLfAlways(LTLfEquivalence([nv, LTLfOr([f2,LTLfAnd([f1,f3])])])))
-        return nv
+    def _tlp_body(self, vs):
+        f1, f2, f3 = vs
+        return LTLfOr([f2, LTLfAnd([f1, f3])])
 
 class LTLfRelease(LTLfBinaryOperator):
     """Class for the LTLf Release formula."""
 
+    __slots__ = ()
 
+    operator_symbol = Symbols.RELEASE.value  # type: OpSymbol
 
-    def delta(self,l,X): #we should be able to manage the ords regarding last      
-        f1 = self.formulas[0].delta(l,X)
-        f2 = self.formulas[1].delta(l,X)
-        if 'last' in X:
-            return f2
-        else: 
-            return And(f2,Or(f1,symbols("s" + str(l.index(self)))))
+    def _delta_function(self, index):
+        d1, d2 = (i._delta_function(index) for i in self.formulas[0:2])
+        s = _state_symbol(index, self)
 
+        def delta(X):
+            f2 = d2(X)
+            if "last" in X or f2 is False or f2 is false:
+                return f2
+            return _and(f2, _or(d1(X), s))
 
+        return delta
 
-    
-    def closure(self):
-        s = set([self, LTLfNot(self)])
-        s = s.union(self.formulas[0].closure())
-        s = s.union(self.formulas[1].closure())
+    def _closure(self):
+        s = {self, self._negated()}
+        s |= self.formulas[0].closure()
+        s |= self.formulas[1].closure()
         return s
 
-
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.RELEASE.value
-
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform to NNF."""
-        return LTLfRelease([f.to_nnf() for f in self.formulas])
+        fs = [f.to_nnf() for f in self.formulas]
+        if len(fs) == 2 and fs[0] is LTLfFalse():
+            return _unnest(LTLfRelease, *fs)
+        return LTLfRelease(fs)
 
     def negate(self):
         """Negate the formula."""
         return LTLfUntil([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Release formula."""
         all_var = new_var(v)
         ex_var = new_var(all_var)
         f1 = self.formulas[0].to_mona(v=ex_var)
         f2 = self.formulas[1].to_mona(v=all_var)
-        return "(all1 {0}: ({1}<={0}&{0}<=max($)) => (({2}) | (ex1 {3}: {1} <= {3} & {3} < {0} & {4})))".format(all_var,v,f2,ex_var,f1)
+        return (
+            f"(all1 {all_var}: ({v}<={all_var}&{all_var}<=max($))"
+            f" => (({f2}) | (ex1 {ex_var}: {v} <= {ex_var} & {ex_var} < {all_var} & {f1})))"
+        )
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         """Return the MONA encoding of an LTLf Release formula."""
         all_var = new_var(v)
         ex_var = new_var(all_var)
         f1 = self.formulas[0].to_mona_s(v=ex_var)
         f2 = self.formulas[1].to_mona_s(v=all_var)
-        return "(all1 {0}: ({1}<={0}&{0}<=max($)) => ({2} | (ex1 {3}: {1} <= {3} & {3} < {0} & {4})))".format(all_var,v,f2,ex_var,f1)
+        return (
+            f"(all1 {all_var}: ({v}<={all_var}&{all_var}<=max($))"
+            f" => ({f2} | (ex1 {ex_var}: {v} <= {ex_var} & {ex_var} < {all_var} & {f1})))"
+        )
 
+    def _tlp_children(self):
+        return (self.formulas[0], self.formulas[1], LTLfWeakNext(self))
 
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+    def _tlp_body(self, vs):
+        f1, f2, f3 = vs
+        return LTLfAnd([f2, LTLfOr([f1, f3])])
 
-        f1 = self.assigned_variable(self.formulas[0],v)
-        if f1 == None:
-            f1 = self.formulas[0]._to_tlp(v,df)
 
-        f2 = self.assigned_variable(self.formulas[1],v)
-        if f2 == None:
-            f2 = self.formulas[1]._to_tlp(v,df)
+class LTLfEventually(LTLfUnaryOperator):
+    """Class for the LTLf Eventually formula."""
 
-        f3 = self.assigned_variable(LTLfWeakNext(self),v)
-        if f3 == None:
-            f3 = LTLfWeakNext(self)._to_tlp(v,df)
+    __slots__ = ()
 
-        df.add(LTLfAlways(LTLfEquivalence([nv, LTLfAnd([f2,LTLfOr([f1,f3])])])))
-        return nv
+    operator_symbol = Symbols.EVENTUALLY.value  # type: OpSymbol
 
+    def _delta_function(self, index):
+        d1 = self.f._delta_function(index)
+        s = _state_symbol(index, self)
 
-class LTLfEventually(LTLfUnaryOperator):
-    """Class for the LTLf Eventually formula."""
-    
+        def delta(X):
+            f1 = d1(X)
+            return f1 if "last" in X else _or(f1, s)
 
-    def delta(self,l,X): #we should be able to manage the ords regarding last      
-        f1 = self.f.delta(l,X)
-        if 'last' in X:
-            return f1
-        else: 
-            return Or(f1,symbols("s" + str(l.index(self))))
+        return delta
 
-    def closure(self):
-        s = set([self, LTLfNot(self)])
-        s = s.union(self.f.closure())
+    def _closure(self):
+        s = {self, self._negated()}
+        s |= self.f.closure()
         return s
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.EVENTUALLY.value
-
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
-        return LTLfUntil([LTLfTrue(), self.f])
+        return _unnest(LTLfUntil, LTLfTrue(), self.f.to_nnf())
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
         return self.to_nnf().negate()
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Eventually formula."""
         ex_var = new_var(v)
-        return "(ex1 {0}: {1}<={0}&{0}<=max($) & {2})".format(ex_var, v, self.f.to_mona(v=ex_var))
+        return f"(ex1 {ex_var}: {v}<={ex_var}&{ex_var}<=max($) & {self.f.to_mona(v=ex_var)})"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         ex_var = new_var(v)
-        return "(ex1 {0}: {1}<={0}&{0}<=max($) & {2})".format(ex_var, v, self.f.to_mona_s(v=ex_var))
-
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+        return f"(ex1 {ex_var}: {v}<={ex_var}&{ex_var}<=max($) & {self.f.to_mona_s(v=ex_var)})"
 
-        f1 = self.assigned_variable(self.f,v)
-        if f1 == None:
-            f1 = self.f.to_tlp(v,df)
+    def _tlp_children(self):
+        return (self.f, LTLfNext(self))
 
-        f2 = self.assigned_variable(LTLfNext(self),v)
-        if f2 == None:
-            f2 = LTLfNext(self)._to_tlp(v,df)
-        
-        df.add(LTLfAlways(LTLfEquivalence([nv, LTLfOr([f1,f2])])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfOr(vs)
 
 class LTLfAlways(LTLfUnaryOperator):
     """Class for the LTLf Always formula."""
 
+    __slots__ = ()
 
-    def delta(self,l,X): #we should be able to manage the ords regarding last      
-        f1 = self.f.delta(l,X)
-        if 'last' in X:
-            return f1
-        else: 
-            return And(f1,symbols("s" + str(l.index(self))))
+    operator_symbol = Symbols.ALWAYS.value  # type: OpSymbol
 
+    def _delta_function(self, index):
+        d1 = self.f._delta_function(index)
+        s = _state_symbol(index, self)
 
+        def delta(X):
+            f1 = d1(X)
+            return f1 if "last" in X else _and(f1, s)
 
-    def closure(self):
-        s = set([self, LTLfNot(self)])
-        s = s.union(self.f.closure())
-        return s
+        return delta
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.ALWAYS.value
+    def _closure(self):
+        s = {self, self._negated()}
+        s |= self.f.closure()
+        return s
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
-        return LTLfRelease([LTLfFalse(), self.f.to_nnf()])
+        return _unnest(LTLfRelease, LTLfFalse(), self.f.to_nnf())
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
         return self.to_nnf().negate()
 
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf Always formula."""
         all_var = new_var(v)
-        return "(all1 {0}: {1}<={0}&{0}<=max($) => {2})".format(all_var, v, self.f.to_mona(v=all_var))
+        return f"(all1 {all_var}: {v}<={all_var}&{all_var}<=max($) => {self.f.to_mona(v=all_var)})"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
         all_var = new_var(v)
-        return "(all1 {0}: {1}<={0}&{0}<=max($) => {2})".format(all_var, v, self.f.to_mona_s(v=all_var))
-
-    def _to_tlp(self,v,df):
-        nv = self.assigned_variable(self,v)
-        if nv != None:
-            return nv
-        nv = self.new_var2(v)
+        return f"(all1 {all_var}: {v}<={all_var}&{all_var}<=max($) => {self.f.to_mona_s(v=all_var)})"
 
-        f1 = self.assigned_variable(self.f,v)
-        if f1 == None:
-            f1 = self.f._to_tlp(v,df)
+    def _tlp_children(self):
+        return (self.f, LTLfWeakNext(self))
 
-        f2 = self.assigned_variable(LTLfWeakNext(self),v)
-        if f2 == None:
-            f2 = LTLfWeakNext(self)._to_tlp(v,df)
-
-        df.add(LTLfAlways(LTLfEquivalence([nv, LTLfAnd([f1,f2])])))
-        return nv
+    def _tlp_body(self, vs):
+        return LTLfAnd(vs)
 
 
 class LTLfLast(LTLfFormula):
     """Class for the LTLf Last formula."""
 
-    def delta(self,l,X): # How do we handle the final
-        if 'last' in X:
-            return True;
-        else:
-            return False;
+    __slots__ = ()
 
-    def closure(self):
+    def _delta_function(self, index):
+        return lambda X: "last" in X
+
+    def _closure(self):
         return set([])
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return LTLfAnd([LTLfWeakNext(LTLfFalse()), LTLfNot(LTLfEnd())]).to_nnf()
 
@@ -880,7 +1068,7 @@ class LTLfLast(LTLfFormula):
         """Negate the formula."""
         return self.to_nnf().negate()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -891,33 +1079,28 @@ class LTLfLast(LTLfFormula):
         """Get the string representation."""
         return Symbols.LAST.value
 
-    def _to_tlp(self,v,df):
-        return self
-
+    @memoize_mona
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of an LTLf atomic formula."""
-        if v == "0":
-            return "(0 = max($))"
-        else:
-            return "({} = max($))".format(v)
+        return f"({v} = max($))"
 
+    @memoize_mona
     def to_mona_s(self,v="0") -> str:
-        if v == "0":
-            return "(0 = max($))"
-        else:
-            return "({} = max($))".format(v)
+        return f"({v} = max($))"
 
 class LTLfEnd(LTLfFormula):
     """Class for the LTLf End formula."""
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    __slots__ = ()
+
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
     def _members(self):
         return (Symbols.END.value,)
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return LTLfAlways(LTLfFalse()).to_nnf()
 
@@ -929,21 +1112,17 @@ class LTLfEnd(LTLfFormula):
         """Get the string representation."""
         return "_".join(map(str, self._members()))
 
-    def _to_tlp(self,v,df):
-        return self
-
 
 class LTLfBefore(LTLfUnaryOperator):
     """Class for the PLTLf Before formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.BEFORE.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.BEFORE.value  # type: OpSymbol
+    supports_closure = False
+    _closure = _no_closure
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return LTLfBefore(self.f.to_nnf())
 
@@ -951,28 +1130,28 @@ class LTLfBefore(LTLfUnaryOperator):
         """Negate the formula."""
         return LTLfNot(self.f.negate())
 
-    def to_mona(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Before formula."""
         ex_var = new_var(v)
         if v == "0":
             #return "(ex1 {0}: {0}={1}-1 & {0}>=0 & {2})".format( ex_var, v, self.f.to_mona(ex_var))
             return "(false)"
         elif v == "max($)":
-            return "(ex1 {0}: {0}=max($)-1 & max($)>0 & {1})".format(ex_var, self.f.to_mona(ex_var))
+            return f"(ex1 {ex_var}: {ex_var}=max($)-1 & max($)>0 & {self.f.to_mona(ex_var)})"
         else:
-            return "(ex1 {0}: {0}={1}-1 & {0}>=0 & {2})".format( ex_var, v, self.f.to_mona(ex_var))
-
+            return f"(ex1 {ex_var}: {ex_var}={v}-1 & {ex_var}>=0 & {self.f.to_mona(ex_var)})"
 
-    def to_mona_s(self, v="0") -> str:
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Before formula."""
         ex_var = new_var(v)
         if v == "0":
             return "(false)"
         elif v == "max($)":
-            return "(ex1 {0}: {0}=max($)-1 & max($)>0 & {1})".format(ex_var, self.f.to_mona_s(ex_var))
+            return f"(ex1 {ex_var}: {ex_var}=max($)-1 & max($)>0 & {self.f.to_mona_s(ex_var)})"
         else:
-            return "(ex1 {0}: {0}={1}-1 & {0}>=0 & {2})".format( ex_var, v, self.f.to_mona_s(ex_var))
-
+            return f"(ex1 {ex_var}: {ex_var}={v}-1 & {ex_var}>=0 & {self.f.to_mona_s(ex_var)})"
 
     # def to_ldlf(self):
     #     return LDLfDiamond(
@@ -985,14 +1164,14 @@ class LTLfBefore(LTLfUnaryOperator):
 class LTLfWBefore(LTLfUnaryOperator):
     """Class for the PLTLf Before formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.WBEFORE.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.WBEFORE.value  # type: OpSymbol
+    _nnf_from_operands = False
+    supports_closure = False
+    _closure = _no_closure
 
-    def to_nnf(self) -> LTLfFormula:
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
         return None #LTLfBefore(self.f.to_nnf())
 
@@ -1000,28 +1179,28 @@ class LTLfWBefore(LTLfUnaryOperator):
         """Negate the formula."""
         return LTLfNot(self.f.negate())
 
-    def to_mona(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Before formula."""
         ex_var = new_var(v)
         if v == "0":
             #return "(ex1 {0}: {0}={1}-1 & {0}>=0 & {2})".format( ex_var, v, self.f.to_mona(ex_var))
             return "(true)"
         elif v == "max($)":
-            return "(({2} = 0) | (ex1 {0}: {0}=max($)-1 & max($)>0 & {1}))".format(ex_var, self.f.to_mona(ex_var),v)
+            return f"(({v} = 0) | (ex1 {ex_var}: {ex_var}=max($)-1 & max($)>0 & {self.f.to_mona(ex_var)}))"
         else:
-            return "(({1} = 0) | (ex1 {0}: {0}={1}-1 & {0}>=0 & {2}))".format( ex_var, v, self.f.to_mona(ex_var))
-
+            return f"(({v} = 0) | (ex1 {ex_var}: {ex_var}={v}-1 & {ex_var}>=0 & {self.f.to_mona(ex_var)}))"
 
-    def to_mona_s(self, v="0") -> str:
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Before formula."""
         ex_var = new_var(v)
         if v == "0":
             return "(true)"
         elif v == "max($)":
-            return "(({2} = 0) | (ex1 {0}: {0}=max($)-1 & max($)>0 & {1}))".format(ex_var, self.f.to_mona_s(ex_var),v)
+            return f"(({v} = 0) | (ex1 {ex_var}: {ex_var}=max($)-1 & max($)>0 & {self.f.to_mona_s(ex_var)}))"
         else:
-            return "(({1} = 0)|(ex1 {0}: {0}={1}-1 & {0}>=0 & {2}))".format( ex_var, v, self.f.to_mona_s(ex_var))
-
+            return f"(({v} = 0)|(ex1 {ex_var}: {ex_var}={v}-1 & {ex_var}>=0 & {self.f.to_mona_s(ex_var)}))"
 
     # def to_ldlf(self):
     #     return LDLfDiamond(
@@ -1034,44 +1213,54 @@ class LTLfWBefore(LTLfUnaryOperator):
 class LTLfSince(LTLfBinaryOperator):
     """Class for the PLTLf Since formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.SINCE.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.SINCE.value  # type: OpSymbol
+    supports_closure = False
+    _closure = _no_closure
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform to NNF."""
         return LTLfSince([f.to_nnf() for f in self.formulas])
 
     def negate(self):
         """Negate the formula."""
-        return LTLfNot([f.negate() for f in self.formulas])
-
-    def to_mona(self, v="0") -> str:
-        """Return the MONA encoding of a PLTLf Since formula."""
+        return LTLfTrigger([f.negate() for f in self.formulas])
+
+    def _operands(self) -> Tuple[LTLfFormula, LTLfFormula]:
+        """Return the two operands, nesting the operator right for more than two."""
+        if len(self.formulas) > 2:
+            return self.formulas[0], LTLfSince(self.formulas[1:])
+        return self.formulas[0], self.formulas[1]
+
+    def _to_mona(self, v: str, strict: bool) -> str:
+        """Encode the formula, with to_mona_s on the operands if strict."""
+        first, second = self._operands()
+        if strict:
+            first, second = first.to_mona_s, second.to_mona_s
+        else:
+            first, second = first.to_mona, second.to_mona
         if v != "0":
             ex_var = new_var(v)
             all_var = new_var(ex_var)
-            f1 = self.formulas[0].to_mona(v=all_var)
-            f2 = self.formulas[1].to_mona(v=ex_var)
-       #return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
-            return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
+            f1 = first(v=all_var)
+            f2 = second(v=ex_var)
+            return (
+                f"(ex1 {ex_var}: 0<={ex_var}&{ex_var}<={v} & {f2}"
+                f" & (all1 {all_var}: ({ex_var}<{all_var}&{all_var}<={v}) => {f1}))"
+            )
         else:
-            return self.formulas[1].to_mona(v)
+            return second(v)
 
-    def to_mona_s(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Since formula."""
-        if v != "0":
-            ex_var = new_var(v)
-            all_var = new_var(ex_var)
-            f1 = self.formulas[0].to_mona_s(v=all_var)
-            f2 = self.formulas[1].to_mona_s(v=ex_var)
-       #return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
-            return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
-        else:
-            return self.formulas[1].to_mona_s(v)
+        return self._to_mona(v, False)
+
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
+        """Return the MONA encoding of a PLTLf Since formula."""
+        return self._to_mona(v, True)
 
     # def to_ldlf(self):
     #     f1 = self.formulas[0].to_ldlf()
@@ -1092,44 +1281,54 @@ class LTLfSince(LTLfBinaryOperator):
 class LTLfTrigger(LTLfBinaryOperator):
     """Class for the PLTLf Since formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.TRIGGER.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.TRIGGER.value  # type: OpSymbol
+    supports_closure = False
+    _closure = _no_closure
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform to NNF."""
         return LTLfTrigger([f.to_nnf() for f in self.formulas])
 
     def negate(self):
         """Negate the formula."""
-        return LTLfNot([f.negate() for f in self.formulas])
-
-    def to_mona(self, v="0") -> str:
-        """Return the MONA encoding of a PLTLf Since formula."""
-        if v != "0":
-            all_var = new_var(v)
-            ex_var = new_var(all_var)
-            f1 = self.formulas[0].to_mona(v=all_var)
-            f2 = self.formulas[1].to_mona(v=ex_var)
-       #return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
-            return "(all1 {0}: 0<={0}&{0}<={1} => ({2} | (ex1 {3}: ({0}<{3}&{3}<={1}) &  {4})))".format( ex_var, v, f2, all_var, f1)
+        return LTLfSince([f.negate() for f in self.formulas])
+
+    def _operands(self) -> Tuple[LTLfFormula, LTLfFormula]:
+        """Return the two operands, nesting the operator right for more than two."""
+        if len(self.formulas) > 2:
+            return self.formulas[0], LTLfTrigger(self.formulas[1:])
+        return self.formulas[0], self.formulas[1]
+
+    def _to_mona(self, v: str, strict: bool) -> str:
+        """Encode the formula, with to_mona_s on the operands if strict."""
+        first, second = self._operands()
+        if strict:
+            first, second = first.to_mona_s, second.to_mona_s
         else:
-            return self.formulas[1].to_mona(v)
-
-    def to_mona_s(self, v="0") -> str:
-        """Return the MONA encoding of a PLTLf Since formula."""
+            first, second = first.to_mona, second.to_mona
         if v != "0":
             ex_var = new_var(v)
             all_var = new_var(ex_var)
-            f1 = self.formulas[0].to_mona_s(v=all_var)
-            f2 = self.formulas[1].to_mona_s(v=ex_var)
-       #return "(ex1 {0}: 0<={0}&{0}<={1} & {2} & (all1 {3}: ({0}<{3}&{3}<={1}) => {4}))".format( ex_var, v, f2, all_var, f1)
-            return "(all1 {0}: 0<={0}&{0}<={1} => ({2} | (ex1 {3}: ({0}<{3}&{3}<={1}) &  {4})))".format( ex_var, v, f2, all_var, f1)
+            f1 = first(v=all_var)
+            f2 = second(v=ex_var)
+            return (
+                f"(all1 {ex_var}: 0<={ex_var}&{ex_var}<={v}"
+                f" => ({f2} | (ex1 {all_var}: ({ex_var}<{all_var}&{all_var}<={v}) &  {f1})))"
+            )
         else:
-            return self.formulas[1].to_mona_s(v)
+            return second(v)
+
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
+        """Return the MONA encoding of a PLTLf Since formula."""
+        return self._to_mona(v, False)
+
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
+        """Return the MONA encoding of a PLTLf Since formula."""
+        return self._to_mona(v, True)
 
     # def to_ldlf(self):
     #     f1 = self.formulas[0].to_ldlf()
@@ -1150,35 +1349,38 @@ class LTLfTrigger(LTLfBinaryOperator):
 class LTLfOnce(LTLfUnaryOperator):
     """Class for the PLTLf Once formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.ONCE.value
+    __slots__ = ()
 
-    def to_nnf(self) -> LTLfFormula:
+    operator_symbol = Symbols.ONCE.value  # type: OpSymbol
+    supports_closure = False
+    _closure = _no_closure
+
+    def _to_nnf(self) -> LTLfFormula:
         """Transform to NNF."""
-        return LTLfSince([LTLfTrue(), self.f])
+        return LTLfOnce(self.f.to_nnf())
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
-        return self.to_nnf().negate()
+        return LTLfHistorically(self.f.negate())
+
+    def _to_mona(self, v: str, strict: bool) -> str:
+        """Encode the formula, with to_mona_s on the operand if strict."""
+        encode = self.f.to_mona_s if strict else self.f.to_mona
+        if v == "0" or _is_constant(self.f):
+            # at the first instant, or on a constant, only v itself matters
+            return encode(v)
+        ex_var = new_var(v)
+        return f"(ex1 {ex_var}: 0<={ex_var}&{ex_var}<={v} & {encode(ex_var)})"
 
-    def to_mona(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Once formula."""
-        if v != "0":
-            ex_var = new_var(v)
-            return "(ex1 {0}: 0<={0}&{0}<={1} & {2})".format(ex_var,v,self.f.to_mona(ex_var))
-        else:
-            return self.f.to_mona("0")
+        return self._to_mona(v, False)
 
-    def to_mona_s(self, v="0") -> str:
-        if v != "0":
-            ex_var = new_var(v)
-            return "(ex1 {0}: 0<={0}&{0}<={1} & {2})".format(ex_var,v,self.f.to_mona_s(ex_var))
-        else:
-            return self.f.to_mona_s(v)
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
+        """Return the MONA encoding of a PLTLf Once formula."""
+        return self._to_mona(v, True)
 
     # def to_ldlf(self):
     #     return LDLfDiamond(
@@ -1192,44 +1394,57 @@ class LTLfOnce(LTLfUnaryOperator):
 class LTLfHistorically(LTLfUnaryOperator):
     """Class for the PLTLf Historically formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.HISTORICALLY.value
+    __slots__ = ()
 
-    # def to_nnf(self) -> PLTLfFormula:
-    #     """Transform to NNF."""
-    #     return PLTLfRelease([PLTLfFalse(), self.f.to_nnf()])
+    operator_symbol = Symbols.HISTORICALLY.value  # type: OpSymbol
+    supports_closure = False
+    _closure = _no_closure
+
+    def _to_nnf(self) -> LTLfFormula:
+        """Transform to NNF."""
+        return LTLfHistorically(self.f.to_nnf())
 
     def negate(self) -> LTLfFormula:
         """Negate the formula."""
-        return self.to_nnf().negate()
+        return LTLfOnce(self.f.negate())
+
+    def _to_mona(self, v: str, strict: bool) -> str:
+        """Encode the formula, with to_mona_s on the operand if strict."""
+        encode = self.f.to_mona_s if strict else self.f.to_mona
+        if v == "0" or _is_constant(self.f):
+            # at the first instant, or on a constant, only v itself matters
+            return encode(v)
+        all_var = new_var(v)
+        return f"(all1 {all_var}: (0<={all_var}&{all_var}<={v}) => {encode(all_var)})"
 
-    def to_mona(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of a PLTLf Historically formula."""
-        all_var = new_var(v)
-        if v != "0":
-            return "(all1 {0}: (0<={0}&{0}<={1}) => {2})".format(ex_var,v,self.f.to_mona(all_var))
-        else:
-            return self.f.to_mona_s(v)
+        return self._to_mona(v, False)
+
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
+        """Return the MONA encoding of a PLTLf Historically formula."""
+        return self._to_mona(v, True)
 
 
 class LTLfInit(LTLfFormula):
     """Class for the PLTLf Last formula."""
 
-    def closure(self):
-        raise Exception('not implemented')
-    # def to_nnf(self) -> PLTLfFormula:
+    __slots__ = ()
+
+    supports_closure = False
+    _closure = _no_closure
+
+    # def _to_nnf(self) -> PLTLfFormula:
     #     """Transform to NNF."""
     #     return PLTLfAnd([PLTLfWeakBefore(PLTLfFalse()), PLTLfNot(PLTLfEnd())]).to_nnf()
 
     def negate(self) -> LTLfFormula:
-        """Negate the formula."""
-        return self.to_nnf().negate()
+        """Negate the formula: not at the first instant, i.e. there is a previous one."""
+        return LTLfBefore(LTLfTrue())
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -1240,17 +1455,19 @@ class LTLfInit(LTLfFormula):
         """Get the string representation."""
         return Symbols.LAST.value
 
-    def to_mona(self, v="0") -> str:
+    @memoize_mona
+    def to_mona(self, v: str = "0") -> str:
         """Return the MONA encoding of an LTLf atomic formula."""
         if v == "max($)":
             return "(0 = max($))"
         else:
-            return "({} = 0)".format(v)
+            return f"({v} = 0)"
 
-    def to_mona_s(self,v="0") -> str:
+    @memoize_mona
+    def to_mona_s(self, v: str = "0") -> str:
         if v == "max($)":
             return "(0 = max($))"
         else:
-            return "({} = 0)".format(v)
+            return f"({v} = 0)"
 
 
@@ -7,11 +7,13 @@ from subprocess import PIPE, Popen, TimeoutExpired
 import os
 import re
 import signal
+from typing import Union
 
 from sympy import symbols, And, Not, Or, simplify
 
 from ltlf2dfa.base import MonaProgram
 from ltlf2dfa.base import MonaSM
+from ltlf2dfa.base import MonaSF
 #from ltlf2dfa.base import MonaSEQ
 
 PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -150,11 +152,11 @@ def compute_declare_assumption(s):
         return None
 
 
-def createMonafile(p: str):
-    """Write the .mona file."""
+def writeMonafile(p: Union[MonaProgram, MonaSM, MonaSF]):
+    """Write the .mona file, streaming the program to it."""
     try:
         with open("/tmp/automa.mona", "w+") as file:
-            file.write(p)
+            p.write_program(file.write)
     except IOError:
         print("[ERROR]: Problem opening the automa.mona file!")
 
@@ -197,23 +199,20 @@ def isSat(mona_output):
 def to_dfa(f) -> str:
     """Translate to deterministic finite-state automaton."""
     p = MonaProgram(f)
-    mona_p_string = p.mona_program()
-    createMonafile(mona_p_string)
+    writeMonafile(p)
     mona_dfa = invoke_mona("mona -q -w /tmp/automa.mona")
     return output2dot(mona_dfa)
 
 def to_dfa_sm(f) -> str:
     """Translate to deterministic finite-state automaton."""
-    p =MonaSM(f)
-    mona_p_string = p.mona_program()
-    createMonafile(mona_p_string)
+    p = MonaSM(f)
+    writeMonafile(p)
     mona_dfa = invoke_mona("mona -q -w /tmp/automa.mona")
     return output2dot(mona_dfa)
 
 def to_dfa_sf(f1,f2) -> str:
-    p =MonaSF(f1,f2)
-    mona_p_string = p.mona_program()
-    createMonafile(mona_p_string)
+    p = MonaSF(f1, f2)
+    writeMonafile(p)
     mona_output = invoke_mona("mona /tmp/automa.mona")
     return "{} and {} {}".format(f1, f2, isSat(mona_output))
 
@@ -2,5 +2,63 @@
 """This module contains the implementation of the parsers for the supported logic formalisms."""
 import inspect
 import os
+from functools import lru_cache
+from typing import Optional, Type
+
+from lark import Lark, Transformer
+from lark.lark import LarkOptions
+
+try:
+    import lark_cython
+except ImportError:
+    lark_cython = None
+
+# plugins are only accepted by lark >= 1.1, lark-parser rejects the option
+if lark_cython is not None and "_plugins" in LarkOptions._defaults:
+    _PLUGINS = {"_plugins": lark_cython.plugins}
+else:
+    _PLUGINS = {}
 
 CUR_DIR = os.path.dirname(inspect.getfile(inspect.currentframe()))  # type: ignore
+
+
+@lru_cache(maxsize=None)
+def load_parser(grammar: str, transformer: Optional[Type[Transformer]] = None) -> Lark:
+    """
+    Build the LALR parser of a grammar of this package, once per grammar.
+
+    Lark parsers keep no state between parses, so all the instances of a
+    formula parser share the same one. If a transformer class is given, the
+    LALR parser applies it while reducing, without building the parse tree.
+    If lark_cython is installed, and the installed Lark supports plugins,
+    its compiled LALR driver is used.
+
+    :param grammar: the name of the grammar file, e.g. 'ltlf.lark'.
+    :param transformer: the class of the transformer of the parse tree.
+    :return: the parser.
+    """
+    return Lark.open(
+        os.path.join(CUR_DIR, grammar),
+        parser="lalr",
+        transformer=transformer() if transformer is not None else None,
+        **_PLUGINS,
+    )
+
+
+def nary_rule(formula_cls: type, doc: str):
+    """
+    Build the transformer method of the rule of an n-ary operator.
+
+    The rule matches operands separated by operator tokens, hence the
+    operands are the children at even positions.
+
+    :param formula_cls: the class of the formula of the operator.
+    :param doc: the docstring of the method.
+    :return: the transformer method.
+    """
+
+    def rule(self, args):
+        return formula_cls(args[::2])
+
+    rule.__doc__ = doc
+    return rule
@@ -1,11 +1,8 @@
 # -*- coding: utf-8 -*-
 """Implementation of the PLTLf parser."""
 
-from pathlib import Path
+from lark import Transformer
 
-from lark import Lark, Transformer
-
-from ltlf2dfa.helpers import ParsingError
 from ltlf2dfa.pltlf import (
     PLTLfEquivalence,
     PLTLfImplies,
@@ -21,132 +18,37 @@ from ltlf2dfa.pltlf import (
     PLTLfFalse,
     PLTLfLast,
 )
-from ltlf2dfa.parser import CUR_DIR
-from ltlf2dfa.parser.pl import PLTransformer
+from ltlf2dfa.parser import load_parser, nary_rule
 
 
 class PLTLfTransformer(Transformer):
     """PLTLf Transformer."""
 
-    def __init__(self):
-        """Initialize."""
-        super().__init__()
-        self._pl_transformer = PLTransformer()
-
-    def start(self, args):
-        """Entry point."""
-        assert len(args) == 1
-        return args[0]
-
-    def pltlf_formula(self, args):
-        """Parse PLTLf formula."""
-        assert len(args) == 1
-        return args[0]
-
-    def pltlf_equivalence(self, args):
-        """Parse PLTLf Equivalence."""
-        if len(args) == 1:
-            return args[0]
-        elif (len(args) - 1) % 2 == 0:
-            subformulas = args[::2]
-            return PLTLfEquivalence(subformulas)
-        else:
-            raise ParsingError
-
-    def pltlf_implication(self, args):
-        """Parse PLTLf Implication."""
-        if len(args) == 1:
-            return args[0]
-        elif (len(args) - 1) % 2 == 0:
-            subformulas = args[::2]
-            return PLTLfImplies(subformulas)
-        else:
-            raise ParsingError
-
-    def pltlf_or(self, args):
-        """Parse PLTLf Or."""
-        if len(args) == 1:
-            return args[0]
-        elif (len(args) - 1) % 2 == 0:
-            subformulas = args[::2]
-            return PLTLfOr(subformulas)
-        else:
-            raise ParsingError
-
-    def pltlf_and(self, args):
-        """Parse PLTLf And."""
-        if len(args) == 1:
-            return args[0]
-        elif (len(args) - 1) % 2 == 0:
-            subformulas = args[::2]
-            return PLTLfAnd(subformulas)
-        else:
-            raise ParsingError
-
-    def pltlf_since(self, args):
-        """Parse PLTLf Since."""
-        if len(args) == 1:
-            return args[0]
-        elif (len(args) - 1) % 2 == 0:
-            subformulas = args[::2]
-            return PLTLfSince(subformulas)
-        else:
-            raise ParsingError
+    pltlf_equivalence = nary_rule(PLTLfEquivalence, "Parse PLTLf Equivalence.")
+    pltlf_implication = nary_rule(PLTLfImplies, "Parse PLTLf Implication.")
+    pltlf_or = nary_rule(PLTLfOr, "Parse PLTLf Or.")
+    pltlf_and = nary_rule(PLTLfAnd, "Parse PLTLf And.")
+    pltlf_since = nary_rule(PLTLfSince, "Parse PLTLf Since.")
 
     def pltlf_historically(self, args):
         """Parse PLTLf Historically."""
-        if len(args) == 1:
-            return args[0]
-        else:
-            f = args[-1]
-            for _ in args[:-1]:
-                f = PLTLfHistorically(f)
-            return f
+        return PLTLfHistorically(args[-1])
 
     def pltlf_once(self, args):
         """Parse PLTLf Once."""
-        if len(args) == 1:
-            return args[0]
-        else:
-            f = args[-1]
-            for _ in args[:-1]:
-                f = PLTLfOnce(f)
-            return f
+        return PLTLfOnce(args[-1])
 
     def pltlf_before(self, args):
         """Parse PLTLf Before."""
-        if len(args) == 1:
-            return args[0]
-        else:
-            f = args[-1]
-            for _ in args[:-1]:
-                f = PLTLfBefore(f)
-            return f
+        return PLTLfBefore(args[-1])
 
     def pltlf_not(self, args):
         """Parse PLTLf Not."""
-        if len(args) == 1:
-            return args[0]
-        else:
-            f = args[-1]
-            for _ in args[:-1]:
-                f = PLTLfNot(f)
-            return f
+        return PLTLfNot(args[-1])
 
     def pltlf_wrapped(self, args):
         """Parse PLTLf wrapped formula."""
-        if len(args) == 1:
-            return args[0]
-        elif len(args) == 3:
-            _, formula, _ = args
-            return formula
-        else:
-            raise ParsingError
-
-    def pltlf_atom(self, args):
-        """Parse PLTLf Atom."""
-        assert len(args) == 1
-        return args[0]
+        return args[1]
 
     def pltlf_true(self, args):
         """Parse PLTLf True."""
@@ -165,10 +67,8 @@ class PLTLfTransformer(Transformer):
 
     def pltlf_symbol(self, args):
         """Parse PLTLf Symbol."""
-        assert len(args) == 1
-        token = args[0]
-        symbol = str(token)
-        return PLTLfAtomic(symbol)
+        symbol = args[0].value
+        return PLTLfAtomic._unchecked(symbol)
 
 
 class PLTLfParser:
@@ -176,14 +76,11 @@ class PLTLfParser:
 
     def __init__(self):
         """Initialize."""
-        self._transformer = PLTLfTransformer()
-        self._parser = Lark(open(str(Path(CUR_DIR, "pltlf.lark"))), parser="lalr")
+        self._parser = load_parser("pltlf.lark", PLTLfTransformer)
 
     def __call__(self, text):
         """Call."""
-        tree = self._parser.parse(text)
-        formula = self._transformer.transform(tree)
-        return formula
+        return self._parser.parse(text)
 
 
 if __name__ == "__main__":
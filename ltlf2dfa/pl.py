@@ -2,7 +2,6 @@
 
 """This module provides support for Propositional Logic."""
 
-import functools
 from abc import abstractmethod, ABC
 from typing import Set, Any, Optional
 
@@ -99,7 +98,7 @@ class PLFormula(Formula):
 class PLAtomic(AtomicFormula, PLFormula):
     """A class to represent propositional atomic formulas."""
 
-    def find_labels(self) -> Set[Any]:
+    def _find_labels(self) -> Set[Any]:
         """Return the set of symbols."""
         return {self.s}
 
@@ -112,19 +111,17 @@ class PLAtomic(AtomicFormula, PLFormula):
 
     def to_mona(self, v="0") -> str:
         """Return the MONA encoding of a PL atomic formula."""
-        if v != "0":
-            return "({} in {})".format(v, self.s.upper())
-        else:
-            return "(0 in {})".format(self.s.upper())
+        return "({} in {})".format(v, self.s.upper())
 
 
 class PLBinaryOperator(BinaryOperator[PLFormula], PLFormula, ABC):
     """An operator for Propositional Logic."""
 
     def _find_atomics(self) -> Set[PLAtomic]:
-        return functools.reduce(
-            set.union, [f.find_atomics() for f in self.formulas]  # type: ignore
-        )
+        atoms = set()  # type: Set[PLAtomic]
+        for f in self.formulas:
+            atoms |= f.find_atomics()  # type: ignore
+        return atoms
 
 
 class PLTrue(PLAtomic):
@@ -132,17 +129,17 @@ class PLTrue(PLAtomic):
 
     def __init__(self):
         """Initialize the PL true formula."""
-        PLAtomic.__init__(self, Symbols.TRUE.value)
+        self._init_unchecked(Symbols.TRUE.value)
 
     def negate(self) -> "PLFalse":
         """Negate the formula."""
         return PLFalse()
 
-    def find_labels(self) -> Set[Any]:
+    def _find_labels(self) -> Set[Any]:
         """Return the set of symbols."""
         return set()
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         return self
 
@@ -152,17 +149,17 @@ class PLFalse(PLAtomic):
 
     def __init__(self):
         """Initialize the formula."""
-        PLAtomic.__init__(self, Symbols.FALSE.value)
+        self._init_unchecked(Symbols.FALSE.value)
 
     def negate(self) -> "PLTrue":
         """Negate the formula."""
         return PLTrue()
 
-    def find_labels(self) -> Set[Any]:
+    def _find_labels(self) -> Set[Any]:
         """Return the set of symbols."""
         return set()
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         return self
 
@@ -170,12 +167,10 @@ class PLFalse(PLAtomic):
 class PLNot(UnaryOperator[PLFormula], PLFormula):
     """Propositional Not."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.NOT.value
+    operator_symbol = Symbols.NOT.value  # type: OpSymbol
+    _nnf_from_operands = False
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         if not isinstance(self.f, AtomicFormula):
             return self.f.negate().to_nnf()
@@ -193,12 +188,9 @@ class PLNot(UnaryOperator[PLFormula], PLFormula):
 class PLOr(PLBinaryOperator):
     """Propositional Or."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.OR.value
+    operator_symbol = Symbols.OR.value  # type: OpSymbol
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         return PLOr([f.to_nnf() for f in self.formulas])
 
@@ -210,12 +202,9 @@ class PLOr(PLBinaryOperator):
 class PLAnd(PLBinaryOperator):
     """Propositional And."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.AND.value
+    operator_symbol = Symbols.AND.value  # type: OpSymbol
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         return PLAnd([f.to_nnf() for f in self.formulas])
 
@@ -227,16 +216,13 @@ class PLAnd(PLBinaryOperator):
 class PLImplies(PLBinaryOperator):
     """Propositional Implication."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.IMPLIES.value
+    operator_symbol = Symbols.IMPLIES.value  # type: OpSymbol
 
     def negate(self) -> PLFormula:
         """Negate the formula."""
         return self.to_nnf().negate()
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         first, second = self.formulas[0:2]
         final_formula = PLOr([PLNot(first).to_nnf(), second.to_nnf()])
@@ -248,12 +234,10 @@ class PLImplies(PLBinaryOperator):
 class PLEquivalence(PLBinaryOperator):
     """Propositional Equivalence."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.EQUIVALENCE.value
+    operator_symbol = Symbols.EQUIVALENCE.value  # type: OpSymbol
+    _nnf_from_operands = False
 
-    def to_nnf(self):
+    def _to_nnf(self):
         """Transform in NNF."""
         fs = self.formulas
         pos = PLAnd(fs)
@@ -16,13 +16,15 @@ from ltlf2dfa.base import (
 from ltlf2dfa.ltlf2dfa import to_dfa
 from ltlf2dfa.pl import PLAtomic
 from ltlf2dfa.symbols import Symbols, OpSymbol
-from ltlf2dfa.helpers import new_var
+from ltlf2dfa.helpers import HashConsing, new_var, memoize_mona
 
 
-class PLTLfFormula(Formula, ABC):
+class PLTLfFormula(Formula, ABC, metaclass=HashConsing):
     """A class for the PLTLf formula."""
 
-    def to_nnf(self) -> "PLTLfFormula":
+    __slots__ = ("__weakref__",)
+
+    def _to_nnf(self) -> "PLTLfFormula":
         """Convert an PLTLf formula in NNF."""
         return self
 
@@ -56,30 +58,36 @@ class PLTLfFormula(Formula, ABC):
 class PLTLfUnaryOperator(UnaryOperator[PLTLfFormula], PLTLfFormula, ABC):
     """A unary operator for PLTLf."""
 
+    __slots__ = ()
+
 
 class PLTLfBinaryOperator(BinaryOperator[PLTLfFormula], PLTLfFormula, ABC):
     """A binary operator for PLTLf."""
 
+    __slots__ = ()
+
 
 class PLTLfAtomic(AtomicFormula, PLTLfFormula):
     """Class for PLTLf atomic formulas."""
 
+    __slots__ = ()
+
     name_regex = re.compile(r"[a-z][a-z0-9_]*")
 
     def negate(self):
         """Negate the formula."""
         return PLTLfNot(self)
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
-        return PLAtomic(self.s).find_labels()
+        return {str(self.s)}
 
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf atomic formula."""
         if v != "max($)":
             return "({} in {})".format(v, self.s.upper())
         else:
-            return PLAtomic(self.s).to_mona()
+            return PLAtomic._unchecked(str(self.s)).to_mona()
 
     # def to_ldlf(self):
     #     return LDLfPropositional(PLAtomic(self.s)).convert()
@@ -88,15 +96,21 @@ class PLTLfAtomic(AtomicFormula, PLTLfFormula):
 class PLTLfTrue(PLTLfAtomic):
     """Class for the PLTLf True formula."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the formula."""
-        super().__init__(Symbols.TRUE.value)
+        self._init_unchecked(Symbols.TRUE.value)
+
+    def _init_args(self) -> tuple:
+        # the constant takes no arguments: unpickling returns the singleton
+        return ()
 
     def negate(self):
         """Negate the formula."""
         return PLTLfFalse()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -108,15 +122,21 @@ class PLTLfTrue(PLTLfAtomic):
 class PLTLfFalse(PLTLfAtomic):
     """Class for the PLTLf False formula."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the formula."""
-        super().__init__(Symbols.FALSE.value)
+        self._init_unchecked(Symbols.FALSE.value)
+
+    def _init_args(self) -> tuple:
+        # the constant takes no arguments: unpickling returns the singleton
+        return ()
 
     def negate(self):
         """Negate the formula."""
         return PLTLfTrue()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -128,12 +148,12 @@ class PLTLfFalse(PLTLfAtomic):
 class PLTLfNot(PLTLfUnaryOperator):
     """Class for the PLTLf not formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.NOT.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.NOT.value  # type: OpSymbol
+    _nnf_from_operands = False
 
-    def to_nnf(self) -> PLTLfFormula:
+    def _to_nnf(self) -> PLTLfFormula:
         """Transform to NNF."""
         if not isinstance(self.f, AtomicFormula):
             return self.f.negate().to_nnf()
@@ -144,9 +164,10 @@ class PLTLfNot(PLTLfUnaryOperator):
         """Negate the formula."""
         return self.f
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Not formula."""
-        return "~({})".format(self.f.to_mona(v))
+        return f"~({self.f.to_mona(v)})"
 
     # def to_ldlf(self):
     #     return LDLfNot(self.f.to_ldlf())
@@ -155,18 +176,18 @@ class PLTLfNot(PLTLfUnaryOperator):
 class PLTLfAnd(PLTLfBinaryOperator):
     """Class for the PLTLf And formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.AND.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.AND.value  # type: OpSymbol
 
     def negate(self) -> PLTLfFormula:
         """Negate the formula."""
         return PLTLfOr([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf And formula."""
-        return "({})".format(" & ".join([f.to_mona(v) for f in self.formulas]))
+        return "(" + " & ".join([f.to_mona(v) for f in self.formulas]) + ")"
 
     # def to_ldlf(self):
     #     return LDLfAnd([f.to_ldlf() for f in self.formulas])
@@ -175,33 +196,32 @@ class PLTLfAnd(PLTLfBinaryOperator):
 class PLTLfOr(PLTLfBinaryOperator):
     """Class for the PLTLf Or formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.OR.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.OR.value  # type: OpSymbol
 
     def negate(self) -> PLTLfFormula:
         """Negate the formula."""
         return PLTLfAnd([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Or formula."""
-        return "({})".format(" | ".join([f.to_mona(v) for f in self.formulas]))
+        return "(" + " | ".join([f.to_mona(v) for f in self.formulas]) + ")"
 
 
 class PLTLfImplies(PLTLfBinaryOperator):
     """Class for the PLTLf Implication formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.IMPLIES.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.IMPLIES.value  # type: OpSymbol
 
     def negate(self) -> PLTLfFormula:
         """Negate the formula."""
         return self.to_nnf().negate()
 
-    def to_nnf(self) -> PLTLfFormula:
+    def _to_nnf(self) -> PLTLfFormula:
         """Transform to NNF."""
         first, second = self.formulas[0:2]
         final_formula = PLTLfOr([PLTLfNot(first).to_nnf(), second.to_nnf()])
@@ -211,6 +231,7 @@ class PLTLfImplies(PLTLfBinaryOperator):
             )
         return final_formula
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Implication formula."""
         return self.to_nnf().to_mona(v)
@@ -219,12 +240,12 @@ class PLTLfImplies(PLTLfBinaryOperator):
 class PLTLfEquivalence(PLTLfBinaryOperator):
     """Class for the PLTLf Equivalente formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.EQUIVALENCE.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.EQUIVALENCE.value  # type: OpSymbol
+    _nnf_from_operands = False
 
-    def to_nnf(self) -> PLTLfFormula:
+    def _to_nnf(self) -> PLTLfFormula:
         """Transform to NNF."""
         fs = self.formulas
         pos = PLTLfAnd(fs)
@@ -236,6 +257,7 @@ class PLTLfEquivalence(PLTLfBinaryOperator):
         """Negate the formula."""
         return self.to_nnf().negate()
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Equivalence formula."""
         return self.to_nnf().to_mona(v)
@@ -244,12 +266,11 @@ class PLTLfEquivalence(PLTLfBinaryOperator):
 class PLTLfBefore(PLTLfUnaryOperator):
     """Class for the PLTLf Before formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.BEFORE.value
+    __slots__ = ()
 
-    def to_nnf(self) -> PLTLfFormula:
+    operator_symbol = Symbols.BEFORE.value  # type: OpSymbol
+
+    def _to_nnf(self) -> PLTLfFormula:
         """Transform to NNF."""
         return PLTLfBefore(self.f.to_nnf())
 
@@ -257,17 +278,15 @@ class PLTLfBefore(PLTLfUnaryOperator):
         """Negate the formula."""
         return PLTLfNot(self.f.negate())
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Before formula."""
         ex_var = new_var(v)
+        f = self.f.to_mona(ex_var)
         if v != "max($)":
-            return "(ex1 {0}: {0}={1}-1 & {0}>=0 & {2})".format(
-                ex_var, v, self.f.to_mona(ex_var)
-            )
+            return f"(ex1 {ex_var}: {ex_var}={v}-1 & {ex_var}>=0 & {f})"
         else:
-            return "(ex1 {0}: {0}=max($)-1 & max($)>0 & {1})".format(
-                ex_var, self.f.to_mona(ex_var)
-            )
+            return f"(ex1 {ex_var}: {ex_var}=max($)-1 & max($)>0 & {f})"
 
     # def to_ldlf(self):
     #     return LDLfDiamond(
@@ -279,12 +298,11 @@ class PLTLfBefore(PLTLfUnaryOperator):
 class PLTLfSince(PLTLfBinaryOperator):
     """Class for the PLTLf Since formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.SINCE.value
+    __slots__ = ()
 
-    def to_nnf(self):
+    operator_symbol = Symbols.SINCE.value  # type: OpSymbol
+
+    def _to_nnf(self):
         """Transform to NNF."""
         return PLTLfSince([f.to_nnf() for f in self.formulas])
 
@@ -292,6 +310,7 @@ class PLTLfSince(PLTLfBinaryOperator):
         """Negate the formula."""
         return PLTLfNot([f.negate() for f in self.formulas])
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Since formula."""
         ex_var = new_var(v)
@@ -302,20 +321,10 @@ class PLTLfSince(PLTLfBinaryOperator):
             if len(self.formulas) > 2
             else self.formulas[1].to_mona(v=ex_var)
         )
-        if v != "max($)":
-            return (
-                "(ex1 {0}: 0<={0}&{0}<={1} & {2} & "
-                "(all1 {3}: {0}<{3}&{3}<={1} => {4}))".format(
-                    ex_var, v, f2, all_var, f1
-                )
-            )
-        else:
-            return (
-                "(ex1 {0}: 0<={0}&{0}<=max($) & {1} & "
-                "(all1 {2}: {0}<{2}&{2}<=max($) => {3}))".format(
-                    ex_var, f2, all_var, f1
-                )
-            )
+        return (
+            f"(ex1 {ex_var}: 0<={ex_var}&{ex_var}<={v} & {f2} & "
+            f"(all1 {all_var}: {ex_var}<{all_var}&{all_var}<={v} => {f1}))"
+        )
 
     # def to_ldlf(self):
     #     f1 = self.formulas[0].to_ldlf()
@@ -333,12 +342,12 @@ class PLTLfSince(PLTLfBinaryOperator):
 class PLTLfOnce(PLTLfUnaryOperator):
     """Class for the PLTLf Once formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.ONCE.value
+    __slots__ = ()
 
-    def to_nnf(self) -> PLTLfFormula:
+    operator_symbol = Symbols.ONCE.value  # type: OpSymbol
+    _nnf_from_operands = False
+
+    def _to_nnf(self) -> PLTLfFormula:
         """Transform to NNF."""
         return PLTLfSince([PLTLfTrue(), self.f])
 
@@ -346,6 +355,7 @@ class PLTLfOnce(PLTLfUnaryOperator):
         """Negate the formula."""
         return self.to_nnf().negate()
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Once formula."""
         return PLTLfSince([PLTLfTrue(), self.f]).to_mona(v)
@@ -360,12 +370,11 @@ class PLTLfOnce(PLTLfUnaryOperator):
 class PLTLfHistorically(PLTLfUnaryOperator):
     """Class for the PLTLf Historically formula."""
 
-    @property
-    def operator_symbol(self) -> OpSymbol:
-        """Get the operator symbol."""
-        return Symbols.HISTORICALLY.value
+    __slots__ = ()
+
+    operator_symbol = Symbols.HISTORICALLY.value  # type: OpSymbol
 
-    # def to_nnf(self) -> PLTLfFormula:
+    # def _to_nnf(self) -> PLTLfFormula:
     #     """Transform to NNF."""
     #     return PLTLfRelease([PLTLfFalse(), self.f.to_nnf()])
 
@@ -373,6 +382,7 @@ class PLTLfHistorically(PLTLfUnaryOperator):
         """Negate the formula."""
         return self.to_nnf().negate()
 
+    @memoize_mona
     def to_mona(self, v="max($)") -> str:
         """Return the MONA encoding of a PLTLf Historically formula."""
         return PLTLfNot(PLTLfOnce(PLTLfNot(self.f))).to_mona(v)
@@ -381,7 +391,9 @@ class PLTLfHistorically(PLTLfUnaryOperator):
 class PLTLfLast(PLTLfFormula):
     """Class for the PLTLf Last formula."""
 
-    # def to_nnf(self) -> PLTLfFormula:
+    __slots__ = ()
+
+    # def _to_nnf(self) -> PLTLfFormula:
     #     """Transform to NNF."""
     #     return PLTLfAnd([PLTLfWeakBefore(PLTLfFalse()), PLTLfNot(PLTLfEnd())]).to_nnf()
 
@@ -389,7 +401,7 @@ class PLTLfLast(PLTLfFormula):
         """Negate the formula."""
         return self.to_nnf().negate()
 
-    def find_labels(self) -> Set[AtomSymbol]:
+    def _find_labels(self) -> Set[AtomSymbol]:
         """Find the labels."""
         return set()
 
@@ -404,14 +416,14 @@ class PLTLfLast(PLTLfFormula):
 # class PLTLfEnd(PLTLfFormula):
 #     """Class for the PLTLf End formula."""
 #
-#     def find_labels(self) -> Set[AtomSymbol]:
+#     def _find_labels(self) -> Set[AtomSymbol]:
 #         """Find the labels."""
 #         return set()
 #
 #     def _members(self):
 #         return (Symbols.END.value,)
 #
-#     def to_nnf(self) -> PLTLfFormula:
+#     def _to_nnf(self) -> PLTLfFormula:
 #         """Transform to NNF."""
 #         return PLTLfHistorically(PLTLfFalse()).to_nnf()
 #
@@ -15,6 +15,8 @@ from ltlf2dfa.ltlf import (
     LTLfAlways,
     LTLfUntil,
     LTLfRelease,
+    LTLfSince,
+    LTLfTrigger,
     LTLfNext,
     LTLfWeakNext,
     LTLfTrue,
@@ -70,6 +72,45 @@ def test_names():
             str(LTLfAtomic(name)) == name
 
 
+def test_parsed_names():
+    parser = LTLfParser()
+
+    assert parser("complex_name") == LTLfAtomic("complex_name")
+    assert parser("a & b").find_labels() == {"a", "b"}
+
+
+def test_gen_tlp():
+    parser = LTLfParser()
+
+    assert {str(f) for f in parser("a").gen_tlp()} == {"a"}
+    assert {str(f) for f in parser("a U b").gen_tlp()} == {
+        "G((last -> !(v1)))",
+        "G((v0 <-> (b | (a & v1))))",
+        "G((v1 <-> X(v0)))",
+        "v0",
+    }
+    assert {str(f) for f in parser("G(a -> X b)").gen_tlp()} == {
+        "G((last -> !(v2)))",
+        "G((last -> v3))",
+        "G((v0 <-> (v1 & v3)))",
+        "G((v1 <-> (a -> v2)))",
+        "G((v2 <-> X(b)))",
+        "G((v3 <-> WX(v0)))",
+        "v0",
+    }
+
+
+def test_delta_function():
+    parser = LTLfParser()
+
+    for s in ["a U X b", "(a <-> b) R (c -> X d)", "F(a & !b) & G(c | WX d)", "last & X a"]:
+        f = parser(s)
+        l = sorted(f.closure(), key=str)
+        delta = f.delta_function(l)
+        for X in [set(), {"a"}, {"a", "last"}, {"b", "c"}, {"a", "b", "c", "d"}]:
+            assert delta(X) == f.delta(l, X)
+
+
 def test_nnf():
     parser = LTLfParser()
     a, b, c = [LTLfAtomic(c) for c in "abc"]
@@ -100,11 +141,29 @@ def test_nnf():
     f = parser("!(a R b)")
     assert f.to_nnf() == LTLfUntil([LTLfNot(a), LTLfNot(b)])
 
+    # Since and Trigger
+    f = parser("!(a S b)")
+    assert f.to_nnf() == LTLfTrigger([LTLfNot(a), LTLfNot(b)])
+    f = parser("!(a T b)")
+    assert f.to_nnf() == LTLfSince([LTLfNot(a), LTLfNot(b)])
+
     f = parser("!(F (a | b))")
     assert f.to_nnf() == LTLfAlways(LTLfAnd([LTLfNot(a), LTLfNot(b)])).to_nnf()
     f = parser("!(G (a | b))")
     assert f.to_nnf() == LTLfEventually(LTLfAnd([LTLfNot(a), LTLfNot(b)])).to_nnf()
 
+    # nested conjunctions and disjunctions are flattened
+    f = parser("!(a | (b | !c)) & (true & !a)")
+    assert f.to_nnf() == LTLfAnd([LTLfNot(a), LTLfNot(b), c])
+    f = parser("a | (b & false)")
+    assert f.to_nnf() is a
+
+    # F and G are idempotent
+    f = parser("F(F !(a & b))")
+    assert f.to_nnf() == LTLfUntil([LTLfTrue(), LTLfOr([LTLfNot(a), LTLfNot(b)])])
+    f = parser("!(F(F !a))")
+    assert f.to_nnf() == LTLfRelease([LTLfFalse(), a])
+
 
 def test_mona():
     parser = LTLfParser()
@@ -269,3 +328,46 @@ class TestParsingTree:
 
         with pytest.raises(lark.UnexpectedInput):
             self.checker.precedence_check("!X", list("!X"))
+
+
+def test_historically_mona():
+    from ltlf2dfa.ltlf import LTLfHistorically
+
+    f = LTLfHistorically(LTLfAtomic("a"))
+    assert f.to_mona(v="0") == "(0 in A)"
+    assert f.to_mona_s(v="0") == "(0 in A_p)"
+    assert f.to_mona(v="v_1") == "(all1 v_2: (0<=v_2&v_2<=v_1) => (v_2 in A))"
+    assert f.to_mona_s(v="v_1") == "(all1 v_2: (0<=v_2&v_2<=v_1) => (v_2 in A_p))"
+
+
+def test_past_constant_mona():
+    from ltlf2dfa.ltlf import LTLfHistorically, LTLfOnce
+
+    assert LTLfOnce(LTLfTrue()).to_mona(v="v_1") == "true"
+    assert LTLfHistorically(LTLfFalse()).to_mona_s(v="v_1") == "false"
+    assert LTLfOnce(LTLfAtomic("true")).to_mona(v="v_1") != "true"
+
+
+def test_once_nnf():
+    from ltlf2dfa.ltlf import LTLfHistorically, LTLfOnce
+
+    a = LTLfAtomic("a")
+    assert LTLfOnce(LTLfNot(LTLfNot(a))).to_nnf() == LTLfOnce(a)
+    assert LTLfNot(LTLfOnce(a)).to_nnf() == LTLfHistorically(LTLfNot(a))
+
+
+def test_past_negate():
+    from ltlf2dfa.ltlf import LTLfBefore, LTLfHistorically, LTLfInit, LTLfOnce
+
+    a = LTLfAtomic("a")
+    assert LTLfNot(LTLfHistorically(a)).to_nnf() == LTLfOnce(LTLfNot(a))
+    assert LTLfNot(LTLfInit()).to_nnf() == LTLfBefore(LTLfTrue())
+
+
+def test_nary_since_mona():
+    parser = LTLfParser()
+
+    for op in "ST":
+        f, g = parser(f"a {op} b {op} c"), parser(f"a {op} (b {op} c)")
+        assert f.to_mona(v="v_1") == g.to_mona(v="v_1")
+        assert f.to_mona_s(v="max($)") == g.to_mona_s(v="max($)")
@@ -31,6 +31,7 @@ def test_pltlf_example_readme():
 
 def test_hash_consistency_after_pickling():
     from ltlf2dfa.parser.ltlf import LTLfParser
+    import gc
     import pickle
 
     parser = LTLfParser()
@@ -39,6 +40,9 @@ def test_hash_consistency_after_pickling():
 
     h = hash(old_obj)
     pickle.dump(old_obj, open("temp", "wb"))
+    # an alive equal formula would be returned as it is: drop it first
+    del old_obj
+    gc.collect()
     new_obj = pickle.load(open("temp", "rb"))
 
     assert new_obj._hash is None
@@ -62,3 +66,237 @@ def test_QuotedFormula():
     for member in dir(f):
         assert member in dir_qf
         assert hasattr(qf, member)
+
+
+def test_find_labels_cached():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+
+    parsed_formula = LTLfParser()("G(a -> X b) & F c")
+    labels = parsed_formula.find_labels()
+
+    assert labels == {"a", "b", "c"}
+    assert parsed_formula.find_labels() is labels
+
+
+def test_slots_state_after_pickling():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfAnd
+    import pickle
+
+    f = LTLfParser()("G(a -> X b) & F c")
+    old_obj = LTLfAnd([f, LTLfAtomic(f)])
+    new_obj = pickle.loads(pickle.dumps(old_obj))
+
+    assert new_obj == old_obj
+    assert new_obj.formulas[0].formulas == f.formulas
+    assert new_obj.find_labels() == old_obj.find_labels()
+
+
+def test_find_labels_deep_formula():
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfNext, LTLfAnd
+
+    f = LTLfAtomic("a")
+    for _ in range(5000):
+        f = LTLfNext(LTLfAnd([f, LTLfAtomic("b")]))
+
+    assert f.find_labels() == {"a", "b"}
+
+
+def test_find_labels_shared_subformulas():
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfNext, LTLfAnd
+
+    f = LTLfAtomic("a")
+    for _ in range(100):
+        f = LTLfAnd([f, LTLfNext(f)])
+
+    assert f.find_labels() == {"a"}
+
+
+def test_mona_sf_repr():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    from ltlf2dfa.base import MonaSF
+
+    parser = LTLfParser()
+    p = MonaSF(parser("a & b"), parser("b & a"))
+
+    assert repr(p) == "((a & b))<->((b & a))"
+    assert repr(p) is repr(p)
+
+
+def test_mona_encoding_cached():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+
+    f = LTLfParser()("!(a & !b) | (a <-> b)")
+
+    assert f.to_mona("0") is f.to_mona("0")
+    assert f.to_mona_s("0") is f.to_mona_s(v="0")
+    assert f.to_mona("v_1") == "(~(((v_1 in A) & ~((v_1 in B)))) | ((v_1 in A) <=> (v_1 in B)))"
+
+
+def test_nnf_cached():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+
+    f = LTLfParser()("!(a -> X(b U c))")
+    nnf = f.to_nnf()
+
+    assert str(nnf) == "(a & WX((!(b) R !(c))))"
+    assert f.to_nnf() is nnf
+
+
+def test_hash_consing():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfNext, LTLfTrue
+
+    parser = LTLfParser()
+    f = parser("G(a -> X b) & c")
+
+    assert parser("G(a -> X b) & c") is f
+    assert LTLfNext(LTLfAtomic("b")) is parser("X b")
+    assert LTLfTrue() is LTLfTrue()
+    assert LTLfAtomic("true") is not LTLfTrue()
+
+
+def test_hash_consing_pltlf():
+    from ltlf2dfa.parser.pltlf import PLTLfParser
+    from ltlf2dfa.pltlf import PLTLfAtomic, PLTLfBefore
+    import pickle
+
+    parser = PLTLfParser()
+    f = parser("H(a -> Y b) & O c")
+
+    assert parser("H(a -> Y b) & O c") is f
+    assert PLTLfBefore(PLTLfAtomic("b")) is parser("Y b")
+    assert pickle.loads(pickle.dumps(f)) == f
+
+
+def test_constant_formulas_are_singletons():
+    from ltlf2dfa.ltlf import LTLfEnd, LTLfFalse, LTLfLast, LTLfTrue
+
+    for cls in (LTLfTrue, LTLfFalse, LTLfLast, LTLfEnd):
+        f = cls()
+        assert cls() is f
+        assert f.to_nnf() is cls().to_nnf()
+    assert LTLfTrue() is not LTLfFalse()
+    assert LTLfTrue().negate() is LTLfFalse()
+
+
+def test_nnf_deep_formula():
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfNext, LTLfSince
+
+    f = LTLfAtomic("a")
+    for _ in range(5000):
+        f = LTLfSince([LTLfAtomic("b"), LTLfNext(f)])
+
+    assert f.to_nnf() is f
+
+
+def test_nnf_nested_equivalences():
+    from ltlf2dfa.ltlf import LTLfAtomic, LTLfEquivalence, LTLfNext, LTLfNot
+
+    f = LTLfAtomic("a")
+    for i in range(60):
+        f = LTLfEquivalence([LTLfNext(f), LTLfAtomic("b%d" % i)])
+
+    nnf = f.to_nnf()
+    assert nnf.find_labels() == f.find_labels()
+    assert LTLfNot(f).to_nnf() is f.negate()
+
+
+def test_parser_without_lark_plugins():
+    import importlib
+    import sys
+    import types
+
+    import ltlf2dfa.parser
+    from lark.lark import LarkOptions
+    from ltlf2dfa.parser.ltlf import LTLfTransformer
+    from ltlf2dfa.ltlf import LTLfAtomic
+
+    stub = types.ModuleType("lark_cython")
+    stub.plugins = {}
+    saved = sys.modules.get("lark_cython")
+    sys.modules["lark_cython"] = stub
+    try:
+        module = importlib.reload(ltlf2dfa.parser)
+        if "_plugins" not in LarkOptions._defaults:
+            assert module._PLUGINS == {}
+        parser = module.load_parser("ltlf.lark", LTLfTransformer)
+        assert parser.parse("a") is LTLfAtomic("a")
+    finally:
+        if saved is None:
+            del sys.modules["lark_cython"]
+        else:
+            sys.modules["lark_cython"] = saved
+        importlib.reload(ltlf2dfa.parser)
+
+
+def test_pickling_after_closure():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    import pickle
+
+    f = LTLfParser()("G(a -> X b) U c")
+    closure = f.closure()
+    new_obj = pickle.loads(pickle.dumps(f))
+
+    assert new_obj is f
+    assert new_obj.closure() is closure
+
+
+def test_mona_write_program():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    from ltlf2dfa.base import MonaProgram, MonaSF, MonaSM
+
+    parser = LTLfParser()
+    programs = [MonaProgram(parser("G(a -> X b)")), MonaSM(parser("a U b"))]
+    for x, y in [("a & b", "b | a"), ("a", "a & c"), ("a & c", "a"), ("a", "b")]:
+        programs.append(MonaSF(parser(x), parser(y)))
+
+    for p in programs:
+        chunks = []
+        p.write_program(chunks.append)
+        assert "".join(chunks) == p.mona_program()
+
+
+def test_hash_consing_collects_formulas():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    import gc
+    import weakref
+
+    f = LTLfParser()("F(a & !b) & G(c | WX d)")
+    f.closure()
+    f.to_nnf()
+    alive = weakref.ref(f)
+    del f
+    gc.collect()
+
+    assert alive() is None
+
+
+def test_hash_consing_after_pickling():
+    from ltlf2dfa.parser.ltlf import LTLfParser
+    from ltlf2dfa.ltlf import LTLfAnd, LTLfAtomic, LTLfNot
+    import pickle
+
+    f = LTLfParser()("G(a -> X b) & (c U d)")
+    a = LTLfAtomic("a")
+
+    assert pickle.loads(pickle.dumps(f)) is f
+
+    g = pickle.loads(pickle.dumps(LTLfAnd([a, LTLfNot(a)])))
+    assert g is LTLfAnd([a, LTLfNot(a)])
+    assert g.formulas[0] is a
+
+
+def test_constant_formulas_after_pickling():
+    from ltlf2dfa.ltlf import LTLfAnd, LTLfAtomic, LTLfEnd, LTLfFalse, LTLfLast, LTLfTrue
+    from ltlf2dfa.pltlf import PLTLfFalse, PLTLfLast, PLTLfTrue
+    import pickle
+
+    for c in (LTLfTrue, LTLfFalse, LTLfLast, LTLfEnd, PLTLfTrue, PLTLfFalse, PLTLfLast):
+        assert pickle.loads(pickle.dumps(c())) is c()
+
+    # the NNF simplifications compare the constants by identity
+    a = LTLfAtomic("a")
+    f = pickle.loads(pickle.dumps(LTLfAnd([a, LTLfTrue()])))
+    assert f.to_nnf() is a
+    assert LTLfAnd([a, LTLfTrue()]).to_nnf() is a